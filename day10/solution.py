@@ -1,8 +1,16 @@
+import os
 import re
-from typing import List, Tuple, Set
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from math import gcd
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Set
 import numpy as np
-from scipy.optimize import linprog
-from scipy.optimize import milp, LinearConstraint, Bounds
+
+# Part 2 backend: 'exact' (pure Python) or 'scipy' (MILP). SciPy is only
+# imported when the 'scipy' backend or the block batch mode is used.
+JOLTAGE_BACKEND = os.environ.get('DAY10_JOLTAGE_BACKEND', 'exact')
 
 def parse_machine(line: str) -> Tuple[List[int], List[Set[int]], List[int]]:
     """Parse a machine configuration line.
@@ -34,6 +42,61 @@ def parse_machine(line: str) -> Tuple[List[int], List[Set[int]], List[int]]:
 
     return target, buttons, joltages
 
+# One pass over a line picks up the lights, every button and the joltages
+MACHINE_PATTERN = re.compile(r'\[([.#]*)\]|\(([0-9,]+)\)|\{([0-9,]*)\}')
+
+class Machine(NamedTuple):
+    """Compact machine record produced by parse_machine_record."""
+    lights: int          # bit i set when light i must end up on
+    n_lights: int
+    buttons: List[int]   # bit i set when the button toggles light/counter i
+    joltages: array      # array('H') of counter targets
+
+def parse_machine_record(line: str) -> Machine:
+    """Parse a machine line into a compact Machine record.
+
+    Raises ValueError if a button refers to a light or counter the machine
+    does not have.
+    """
+    lights = None
+    buttons = []
+    joltages = array('H')
+    for match in MACHINE_PATTERN.finditer(line):
+        pattern, button, joltage = match.groups()
+        if button is not None:
+            mask = 0
+            for x in button.split(','):
+                mask |= 1 << int(x)
+            buttons.append(mask)
+        elif pattern is not None:
+            lights = pattern
+        elif joltage:
+            joltages = array('H', map(int, joltage.split(',')))
+    if lights is None:
+        raise ValueError(f"No lights pattern found in: {line}")
+    target = int(lights[::-1].replace('.', '0').replace('#', '1') or '0', 2)
+    n_slots = len(joltages) if joltages else len(lights)
+    for mask in buttons:
+        if mask >> n_slots:
+            raise ValueError(f"Button {mask_indices(mask)} is out of range for {n_slots} counters in: {line}")
+    return Machine(target, len(lights), buttons, joltages)
+
+def iter_machines(lines: Iterable[str]) -> Iterator[Machine]:
+    """Stream Machine records from a file handle (or any iterable of lines)."""
+    for line in lines:
+        line = line.strip()
+        if line:
+            yield parse_machine_record(line)
+
+def mask_indices(mask: int) -> List[int]:
+    """Return the positions of the set bits of mask, lowest first."""
+    indices = []
+    while mask:
+        low = mask & -mask
+        indices.append(low.bit_length() - 1)
+        mask ^= low
+    return indices
+
 def solve_machine_bruteforce(target: List[int], buttons: List[Set[int]]) -> int:
     """Solve using brute force for small button counts.
 
@@ -44,7 +107,7 @@ def solve_machine_bruteforce(target: List[int], buttons: List[Set[int]]) -> int:
 
     if n_buttons > 20:
         # Too many combinations, fall back to GF(2) solution
-        return solve_machine_gf2_simple(target, buttons)
+        return solve_machine_gf2(target, buttons)
 
     min_presses = float('inf')
 
@@ -129,13 +192,229 @@ def solve_machine_gf2_simple(target: List[int], buttons: List[Set[int]]) -> int:
 
     return sum(solution)
 
-def solve_machine_joltage(joltages: List[int], buttons: List[Set[int]]) -> int:
+def solve_machine_gf2(target: List[int], buttons: List[Set[int]]) -> int:
+    """Exact minimum-press solver over GF(2); see solve_machine_gf2_masks."""
+    lights = 0
+    for light_idx, state in enumerate(target):
+        if state:
+            lights |= 1 << light_idx
+    masks = []
+    for button in buttons:
+        mask = 0
+        for light_idx in button:
+            mask |= 1 << light_idx
+        masks.append(mask)
+    return solve_machine_gf2_masks(lights, len(target), masks)
+
+def solve_machine_gf2_masks(lights: int, n_lights: int, buttons: List[int]) -> int:
+    """Exact minimum-press solver over GF(2) using int bitmasks.
+
+    Each light gives one equation whose bits are the buttons that toggle it,
+    with the target bit stored above them. After XOR elimination to reduced
+    row echelon form, every solution is the particular solution XOR some
+    combination of null-space vectors (one per free button), so only
+    2^(free buttons) candidates are scored. They are walked in Gray-code
+    order so each step is a single XOR.
+    """
+    n_buttons = len(buttons)
+    rhs_bit = 1 << n_buttons
+
+    rows = []
+    for light_idx in range(n_lights):
+        row = rhs_bit if lights >> light_idx & 1 else 0
+        for button_idx, button in enumerate(buttons):
+            if button >> light_idx & 1:
+                row |= 1 << button_idx
+        rows.append(row)
+
+    # Reduce to RREF, remembering which button each pivot row solves for
+    pivot_rows = []
+    pivot_cols = []
+    for col in range(n_buttons):
+        col_bit = 1 << col
+        pivot = next((r for r in rows if r & col_bit), None)
+        if pivot is None:
+            continue
+        rows.remove(pivot)
+        rows = [r ^ pivot if r & col_bit else r for r in rows]
+        pivot_rows = [r ^ pivot if r & col_bit else r for r in pivot_rows]
+        pivot_rows.append(pivot)
+        pivot_cols.append(col)
+
+    # Any leftover row is 0 = rhs; a set rhs means the lights are unreachable
+    if any(rows):
+        return -1
+
+    particular = 0
+    for row, col in zip(pivot_rows, pivot_cols):
+        if row & rhs_bit:
+            particular |= 1 << col
+
+    pivot_set = set(pivot_cols)
+    null_vectors = []
+    for free in range(n_buttons):
+        if free in pivot_set:
+            continue
+        vector = 1 << free
+        for row, col in zip(pivot_rows, pivot_cols):
+            if row & (1 << free):
+                vector |= 1 << col
+        null_vectors.append(vector)
+
+    best = particular.bit_count()
+    current = particular
+    for step in range(1, 1 << len(null_vectors)):
+        # Gray code: flip the vector at the lowest set bit of step
+        current ^= null_vectors[(step & -step).bit_length() - 1]
+        presses = current.bit_count()
+        if presses < best:
+            best = presses
+
+    return best
+
+def solve_machine_joltage(joltages: List[int], buttons: List[Set[int]],
+                          backend: Optional[str] = None) -> int:
     """Solve Part 2: find minimum button presses to reach joltage levels.
 
     This is an integer linear programming problem:
     - Minimize sum of button presses
     - Subject to: for each counter, sum of button presses must equal target joltage
+
+    backend is 'exact' or 'scipy' and defaults to JOLTAGE_BACKEND.
+    """
+    backend = backend or JOLTAGE_BACKEND
+    if backend == 'exact':
+        return solve_machine_joltage_exact(joltages, buttons)
+    if backend == 'scipy':
+        return solve_machine_joltage_scipy(joltages, buttons)
+    raise ValueError(f"Unknown joltage backend: {backend}")
+
+def solve_machine_joltage_exact(joltages: List[int], buttons: List[Set[int]]) -> int:
+    """SciPy-free exact solver for the joltage ILP.
+
+    The counter equations are reduced with fraction-free integer elimination,
+    so every pivot button is d * x_p = c - sum(a_f * x_f) over the few free
+    buttons. The free buttons are then searched depth first. Each is bounded
+    by the smallest remaining target among the counters it touches and by
+    the pivot rows staying non-negative, and branches that cannot beat the
+    best total found so far are cut.
     """
+    n_buttons = len(buttons)
+
+    # Augmented integer rows: coefficients per button, then the target
+    rows = []
+    for counter_idx, joltage in enumerate(joltages):
+        rows.append([1 if counter_idx in button else 0 for button in buttons] + [joltage])
+
+    pivots = []  # (pivot column, row)
+    for col in range(n_buttons):
+        pivot = next((r for r in rows if r[col] != 0), None)
+        if pivot is None:
+            continue
+        rows.remove(pivot)
+        if pivot[col] < 0:
+            pivot = [-v for v in pivot]
+
+        def eliminate(row):
+            factor = row[col]
+            if factor == 0:
+                return row
+            row = [pivot[col] * v - factor * p for v, p in zip(row, pivot)]
+            g = 0
+            for v in row:
+                g = gcd(g, v)
+            return [v // g for v in row] if g > 1 else row
+
+        rows = [eliminate(r) for r in rows]
+        pivots = [(c, eliminate(r)) for c, r in pivots]
+        pivots.append((col, pivot))
+
+    # Leftover rows read 0 = target; a non-zero target is unreachable
+    if any(r[-1] != 0 for r in rows):
+        return -1
+
+    pivot_cols = {c for c, _ in pivots}
+    free = [f for f in range(n_buttons) if f not in pivot_cols]
+
+    # Each button is bounded by the smallest target among its counters
+    upper = []
+    for f in free:
+        touched = [joltages[c] for c in buttons[f] if c < len(joltages)]
+        upper.append(min(touched) if touched else 0)
+
+    # Pivot rows keep their divisor d, target c and free coefficients a
+    divisors = [r[c] for c, r in pivots]
+    targets = [r[-1] for c, r in pivots]
+    coeffs = [[r[f] for f in free] for c, r in pivots]
+
+    # Scale the objective by lcm(d) to stay in integers:
+    # scale * total = base + sum(weights[k] * x_free[k])
+    scale = 1
+    for d in divisors:
+        scale = scale * d // gcd(scale, d)
+    base = sum(scale // d * c for d, c in zip(divisors, targets))
+    weights = [scale - sum(scale // d * a[k] for d, a in zip(divisors, coeffs))
+               for k in range(len(free))]
+
+    # Best case contribution of the free buttons after position k, and how
+    # much they can raise each pivot row's residual at most
+    rest_bound = [0] * (len(free) + 1)
+    for k in range(len(free) - 1, -1, -1):
+        rest_bound[k] = rest_bound[k + 1] + min(0, weights[k] * upper[k])
+    slack = [[0] * len(pivots) for _ in range(len(free) + 1)]
+    for k in range(len(free) - 1, -1, -1):
+        slack[k] = [s + max(0, -a[k]) * upper[k] for s, a in zip(slack[k + 1], coeffs)]
+
+    # Counters touched by each free button, for the original-space bound
+    free_counters = [[c for c in buttons[f] if c < len(joltages)] for f in free]
+
+    best = [None]
+
+    def search(k, residual, objective, counters, pressed):
+        if k == len(free):
+            if all(r >= 0 and r % d == 0 for r, d in zip(residual, divisors)):
+                best[0] = objective
+            return
+
+        lo, hi = 0, upper[k]
+        for c in free_counters[k]:
+            hi = min(hi, counters[c])
+        for r, s, a in zip(residual, slack[k + 1], coeffs):
+            limit = r + s
+            if a[k] > 0:
+                hi = min(hi, limit // a[k])
+            elif a[k] < 0:
+                lo = max(lo, -(-limit // a[k]))
+            elif limit < 0:
+                return
+        if lo > hi:
+            return
+
+        weight = weights[k]
+        values = range(lo, hi + 1) if weight >= 0 else range(hi, lo - 1, -1)
+        for value in values:
+            next_objective = objective + weight * value
+            if best[0] is not None and next_objective + rest_bound[k + 1] >= best[0]:
+                break
+            next_counters = list(counters)
+            for c in free_counters[k]:
+                next_counters[c] -= value
+            # The remaining presses must still fill the fullest counter
+            if best[0] is not None and (pressed + value + max(next_counters, default=0)) * scale >= best[0]:
+                continue
+            search(k + 1, [r - a[k] * value for r, a in zip(residual, coeffs)],
+                   next_objective, next_counters, pressed + value)
+
+    search(0, targets, base, list(joltages), 0)
+
+    if best[0] is None:
+        return -1
+    return best[0] // scale
+
+def solve_machine_joltage_scipy(joltages: List[int], buttons: List[Set[int]]) -> int:
+    """Solve the joltage ILP with scipy.optimize.milp."""
+    from scipy.optimize import linprog, milp, LinearConstraint, Bounds
+
     n_counters = len(joltages)
     n_buttons = len(buttons)
 
@@ -174,37 +453,146 @@ def solve_machine_joltage(joltages: List[int], buttons: List[Set[int]]) -> int:
                 return int(np.sum(x))
         return -1
 
+def button_counter_pairs(machine: Machine) -> Tuple[np.ndarray, np.ndarray]:
+    """(button, counter) index arrays for every counter a machine's buttons touch.
+
+    Raises ValueError if a button touches a counter past the joltage list.
+    """
+    n_counters = len(machine.joltages)
+    for mask in machine.buttons:
+        if mask >> n_counters:
+            raise ValueError(f"Button {mask_indices(mask)} is out of range for {n_counters} counters")
+    if n_counters <= 64:
+        masks = np.array(machine.buttons, dtype=np.uint64).reshape(-1, 1)
+        bits = (masks >> np.arange(n_counters, dtype=np.uint64)) & np.uint64(1)
+        return np.nonzero(bits)
+    pairs = [(b, c) for b, mask in enumerate(machine.buttons) for c in mask_indices(mask)]
+    return (np.array([b for b, _ in pairs], dtype=np.int64),
+            np.array([c for _, c in pairs], dtype=np.int64))
+
+def build_joltage_constraints(machines: List[Machine]):
+    """Build the block-diagonal sparse system A x = b for a list of Machine records.
+
+    The button bitmasks are expanded straight into the nonzeros of A.
+    Returns (A, b, button_offsets) where machine k owns the variables
+    button_offsets[k]:button_offsets[k + 1].
+    """
+    from scipy.sparse import coo_matrix
+
+    row_chunks = []
+    col_chunks = []
+    targets = []
+    button_offsets = [0]
+    counter_offset = 0
+    for machine in machines:
+        button_offset = button_offsets[-1]
+        button_idx, counter_idx = button_counter_pairs(machine)
+        row_chunks.append(counter_idx.astype(np.int64) + counter_offset)
+        col_chunks.append(button_idx.astype(np.int64) + button_offset)
+        targets.extend(machine.joltages)
+        counter_offset += len(machine.joltages)
+        button_offsets.append(button_offset + len(machine.buttons))
+
+    rows = np.concatenate(row_chunks) if row_chunks else np.zeros(0, dtype=np.int64)
+    cols = np.concatenate(col_chunks) if col_chunks else np.zeros(0, dtype=np.int64)
+    A = coo_matrix((np.ones(len(rows)), (rows, cols)), shape=(counter_offset, button_offsets[-1])).tocsr()
+    return A, np.array(targets, dtype=float), button_offsets
+
+def solve_joltage_block(machines: List[Machine]) -> List[int]:
+    """Solve all machines as one block-diagonal MILP.
+
+    The blocks share no variables, so the optimum of the combined problem is
+    optimal for every block. The MIP gap is set to zero so the summed
+    objective cannot hide a per-machine slack. If the combined problem is
+    infeasible, each machine is solved on its own to find the failing ones.
+    """
+    from scipy.optimize import milp, LinearConstraint, Bounds
+
+    if not machines:
+        return []
+    A, b, offsets = build_joltage_constraints(machines)
+    n_vars = offsets[-1]
+    result = milp(c=np.ones(n_vars),
+                  constraints=LinearConstraint(A, b, b),
+                  bounds=Bounds(lb=0, ub=np.inf),
+                  integrality=np.ones(n_vars),
+                  options={'mip_rel_gap': 0})
+    if not result.success:
+        return [solve_machine_joltage_scipy(list(m.joltages), [mask_indices(b) for b in m.buttons])
+                for m in machines]
+
+    x = np.round(result.x).astype(np.int64)
+    return [int(x[offsets[k]:offsets[k + 1]].sum()) for k in range(len(machines))]
+
+def _solve_joltage_machine(machine: Machine, backend: Optional[str] = None) -> int:
+    buttons = [mask_indices(button) for button in machine.buttons]
+    return solve_machine_joltage(list(machine.joltages), buttons, backend)
+
+def solve_joltage_batch(machines: Iterable[Machine],
+                        mode: str = 'block', workers: Optional[int] = None,
+                        backend: Optional[str] = None) -> Dict:
+    """Solve part 2 for a batch of Machine records (e.g. from iter_machines) at once.
+
+    mode='block' solves one block-diagonal MILP (see solve_joltage_block) and
+    always needs SciPy; mode='pool' runs solve_machine_joltage with the given
+    backend over a process pool of `workers`.
+
+    Returns a dict with the per-machine 'presses' (-1 when unsolvable), their
+    'total' (-1 if any machine failed) and the 'wall_time' in seconds.
+    """
+    machines = list(machines)
+    start = time.perf_counter()
+    if mode == 'block':
+        presses = solve_joltage_block(machines)
+    elif mode == 'pool':
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            solve = partial(_solve_joltage_machine, backend=backend)
+            presses = list(pool.map(solve, machines, chunksize=16))
+    else:
+        raise ValueError(f"Unknown batch mode: {mode}")
+    wall_time = time.perf_counter() - start
+
+    total = -1 if -1 in presses else sum(presses)
+    return {'presses': presses, 'total': total, 'wall_time': wall_time}
+
 def solve_part1(filename: str) -> int:
     """Solve part 1: find total minimum button presses for all machines."""
-    with open(filename, 'r') as f:
-        lines = [line.strip() for line in f if line.strip()]
-
     total_presses = 0
-    for i, line in enumerate(lines):
-        target, buttons, joltages = parse_machine(line)
-        presses = solve_machine_bruteforce(target, buttons)
-        if presses == -1:
-            print(f"Machine {i+1}: No solution found!")
-            return -1
-        print(f"Machine {i+1}: {presses} presses needed")
-        total_presses += presses
+    with open(filename, 'r') as f:
+        for i, machine in enumerate(iter_machines(f)):
+            presses = solve_machine_gf2_masks(machine.lights, machine.n_lights, machine.buttons)
+            if presses == -1:
+                print(f"Machine {i+1}: No solution found!")
+                return -1
+            print(f"Machine {i+1}: {presses} presses needed")
+            total_presses += presses
 
     return total_presses
 
-def solve_part2(filename: str) -> int:
-    """Solve part 2: find total minimum button presses for joltage configuration."""
-    with open(filename, 'r') as f:
-        lines = [line.strip() for line in f if line.strip()]
+def solve_part2(filename: str, batch: Optional[str] = None, backend: Optional[str] = None) -> int:
+    """Solve part 2: find total minimum button presses for joltage configuration.
+
+    With batch='block' or batch='pool' the machines are handed to
+    solve_joltage_batch instead of being solved and printed one by one.
+    backend picks the per-machine solver (see solve_machine_joltage).
+    Without batching the machines are streamed from the file one at a time.
+    """
+    if batch is not None:
+        with open(filename, 'r') as f:
+            result = solve_joltage_batch(iter_machines(f), mode=batch, backend=backend)
+        print(f"Solved {len(result['presses'])} machines in {result['wall_time']:.3f}s ({batch} mode)")
+        return result['total']
 
     total_presses = 0
-    for i, line in enumerate(lines):
-        target, buttons, joltages = parse_machine(line)
-        presses = solve_machine_joltage(joltages, buttons)
-        if presses == -1:
-            print(f"Machine {i+1}: No solution found!")
-            return -1
-        print(f"Machine {i+1}: {presses} presses needed (joltages: {joltages})")
-        total_presses += presses
+    with open(filename, 'r') as f:
+        for i, machine in enumerate(iter_machines(f)):
+            buttons = [mask_indices(button) for button in machine.buttons]
+            presses = solve_machine_joltage(machine.joltages, buttons, backend)
+            if presses == -1:
+                print(f"Machine {i+1}: No solution found!")
+                return -1
+            print(f"Machine {i+1}: {presses} presses needed (joltages: {machine.joltages.tolist()})")
+            total_presses += presses
 
     return total_presses
 
@@ -221,7 +609,7 @@ def test_example():
     total_part1 = 0
     for i, line in enumerate(lines):
         target, buttons, joltages = parse_machine(line)
-        presses = solve_machine_bruteforce(target, buttons)
+        presses = solve_machine_gf2(target, buttons)
         print(f"  Machine {i+1}: {presses} presses (target: {target})")
         total_part1 += presses
     print(f"  Total: {total_part1} presses (Expected: 7)")
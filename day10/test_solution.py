@@ -0,0 +1,94 @@
+import importlib.util
+import random
+import unittest
+from itertools import combinations
+
+from solution import (parse_machine, parse_machine_record, solve_machine_bruteforce,
+                      solve_machine_gf2, solve_machine_gf2_masks, solve_machine_joltage_exact,
+                      solve_machine_joltage_scipy)
+
+EXAMPLE = """[.##.] (3) (1,3) (2) (2,3) (0,2) (0,1) {3,5,4,7}
+[...#.] (0,2,3,4) (2,3) (0,4) (0,1,2) (1,2,3,4) {7,5,12,7,2}
+[.###.#] (0,1,2,3,4) (0,3,4) (0,1,2,4,5) (1,2) {10,11,11,5,10,5}"""
+
+HAS_SCIPY = importlib.util.find_spec('scipy') is not None
+
+def random_buttons(rng, n_counters, n_buttons):
+    """Random non-empty buttons over n_counters counters."""
+    return [set(rng.sample(range(n_counters), rng.randint(1, n_counters)))
+            for _ in range(n_buttons)]
+
+def fewest_toggles(target, buttons):
+    """Smallest number of distinct buttons whose toggles give target, or -1."""
+    for k in range(len(buttons) + 1):
+        for chosen in combinations(buttons, k):
+            lights = [0] * len(target)
+            for button in chosen:
+                for light in button:
+                    lights[light] ^= 1
+            if lights == target:
+                return k
+    return -1
+
+class TestLights(unittest.TestCase):
+    def test_example(self):
+        """The example needs 7 presses in total."""
+        lines = EXAMPLE.split('\n')
+        self.assertEqual(sum(solve_machine_gf2(*parse_machine(line)[:2]) for line in lines), 7)
+
+    def test_gf2_matches_bruteforce(self):
+        """The GF(2) solvers agree with trying every subset of buttons."""
+        rng = random.Random(5)
+        for _ in range(300):
+            n_lights = rng.randint(1, 6)
+            buttons = random_buttons(rng, n_lights, rng.randint(1, 8))
+            target = [rng.randint(0, 1) for _ in range(n_lights)]
+            expected = fewest_toggles(target, buttons)
+            self.assertEqual(solve_machine_gf2(target, buttons), expected, (target, buttons))
+            self.assertEqual(solve_machine_bruteforce(target, buttons), expected)
+
+    def test_record_rejects_unknown_counter(self):
+        """Buttons past the last counter are an error, not silently dropped."""
+        with self.assertRaises(ValueError):
+            parse_machine_record("[.#] (0,2) (1) {1,2}")
+        with self.assertRaises(ValueError):
+            parse_machine_record("[.#] (0,2) (1)")
+
+    def test_record_masks(self):
+        """Bitmask records give the same answers as the set-based parser."""
+        for line in EXAMPLE.split('\n'):
+            target, buttons, _ = parse_machine(line)
+            machine = parse_machine_record(line)
+            self.assertEqual(solve_machine_gf2_masks(machine.lights, machine.n_lights, machine.buttons),
+                             solve_machine_gf2(target, buttons))
+
+class TestJoltage(unittest.TestCase):
+    def test_example(self):
+        """The example needs 33 presses in total."""
+        total = 0
+        for line in EXAMPLE.split('\n'):
+            _, buttons, joltages = parse_machine(line)
+            total += solve_machine_joltage_exact(joltages, buttons)
+        self.assertEqual(total, 33)
+
+    @unittest.skipUnless(HAS_SCIPY, 'needs SciPy')
+    def test_exact_matches_milp(self):
+        """The exact solver agrees with milp on random machines."""
+        rng = random.Random(7)
+        for _ in range(300):
+            n_counters = rng.randint(1, 6)
+            buttons = random_buttons(rng, n_counters, rng.randint(1, 8))
+            if rng.random() < 0.8:
+                # Reachable targets from random presses
+                joltages = [0] * n_counters
+                for button in buttons:
+                    presses = rng.randint(0, 12)
+                    for counter in button:
+                        joltages[counter] += presses
+            else:
+                joltages = [rng.randint(0, 30) for _ in range(n_counters)]
+            self.assertEqual(solve_machine_joltage_exact(joltages, buttons),
+                             solve_machine_joltage_scipy(joltages, buttons), (joltages, buttons))
+
+if __name__ == '__main__':
+    unittest.main()
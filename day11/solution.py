@@ -1,4 +1,10 @@
+import argparse
 import collections
+import sys
+import time
+from array import array
+
+import numpy as np
 
 def parse_input(filename="input.txt"):
     """
@@ -12,62 +18,405 @@ def parse_input(filename="input.txt"):
             graph[source].extend(dests.split())
     return graph
 
-def part1(graph):
+def compile_graph(graph):
     """
-    Solves Part 1: How many different paths lead from 'you' to 'out'?
+    Interns node names to integer IDs and packs the adjacency into CSR arrays.
+    The out-neighbours of node u are targets[offsets[u]:offsets[u + 1]].
+    A topological order of all nodes is computed once and stored alongside.
     """
-    memo = {}
-    def count_paths(start, end):
-        if start in memo:
-            return memo[start]
-        if start == end:
-            return 1
-        
-        count = 0
-        for neighbor in graph.get(start, []):
-            count += count_paths(neighbor, end)
-        
-        memo[start] = count
-        return count
+    ids = {}
+    names = []
+    for source, dests in graph.items():
+        for name in [source, *dests]:
+            if name not in ids:
+                ids[name] = len(names)
+                names.append(name)
 
-    return count_paths('you', 'out')
+    offsets = array('i', [0])
+    targets = array('i')
+    for name in names:
+        targets.extend(ids[dest] for dest in graph.get(name, ()))
+        offsets.append(len(targets))
 
-def part2(graph):
+    compiled = {'names': names, 'ids': ids, 'offsets': offsets, 'targets': targets}
+    compiled['order'] = topological_order(compiled)
+    compiled['position'] = [0] * len(names)
+    for k, u in enumerate(compiled['order']):
+        compiled['position'][u] = k
+    # Path-count vectors keyed by ('from', source) or ('to', target), filled
+    # in lazily by path_counts_from and path_counts_to
+    compiled['vectors'] = {}
+    return compiled
+
+def topological_order(compiled):
     """
-    Solves Part 2: How many paths from 'svr' to 'out' visit both 'dac' and 'fft'?
+    Kahn's algorithm over the CSR arrays.
+    Raises ValueError naming one cycle if the graph is not a DAG.
+    """
+    offsets, targets = compiled['offsets'], compiled['targets']
+    n = len(compiled['names'])
+    indegree = [0] * n
+    for v in targets:
+        indegree[v] += 1
+
+    order = [u for u in range(n) if indegree[u] == 0]
+    for u in order:
+        for v in targets[offsets[u]:offsets[u + 1]]:
+            indegree[v] -= 1
+            if indegree[v] == 0:
+                order.append(v)
+
+    if len(order) < n:
+        raise ValueError(f"Graph has a cycle: {' -> '.join(find_cycle(compiled, indegree))}")
+    return order
+
+def find_cycle(compiled, indegree):
+    """
+    Returns the node names of one cycle among the nodes Kahn's algorithm left
+    behind. Each of them still has a predecessor among them, so walking
+    predecessors must eventually repeat a node.
+    """
+    offsets, targets, names = compiled['offsets'], compiled['targets'], compiled['names']
+    predecessor = {}
+    for u in range(len(names)):
+        if indegree[u] > 0:
+            for v in targets[offsets[u]:offsets[u + 1]]:
+                if indegree[v] > 0:
+                    predecessor[v] = u
+
+    node = next(iter(predecessor))
+    seen = {}
+    walk = []
+    while node not in seen:
+        seen[node] = len(walk)
+        walk.append(node)
+        node = predecessor[node]
+
+    cycle = walk[seen[node]:][::-1]
+    return [names[u] for u in cycle + [cycle[0]]]
+
+def path_counts_from(compiled, source):
+    """
+    Returns the number of paths from node ID source to every node, computed
+    in one pass over the topological order starting at source. Vectors are
+    cached on the compiled graph so each source is only swept once.
+    """
+    key = ('from', source)
+    vectors = compiled['vectors']
+    if key in vectors:
+        return vectors[key]
+    offsets, targets, order = compiled['offsets'], compiled['targets'], compiled['order']
+
+    counts = [0] * len(compiled['names'])
+    counts[source] = 1
+    for k in range(compiled['position'][source], len(order)):
+        u = order[k]
+        c = counts[u]
+        if c:
+            for v in targets[offsets[u]:offsets[u + 1]]:
+                counts[v] += c
+    vectors[key] = counts
+    return counts
+
+def count_paths(compiled, source, target):
     """
-    memo = {}
-    checkpoints = frozenset(['dac', 'fft'])
+    Counts paths from source to target in one pass over the topological order.
+    """
+    ids = compiled['ids']
+    if source not in ids or target not in ids:
+        return 0
+    return path_counts_from(compiled, ids[source])[ids[target]]
+
+def checkpoint_stops(compiled, source, target, checkpoints):
+    """
+    Returns the node IDs a path must pass through in order: source, the
+    distinct checkpoints sorted by topological position, then target.
+    In a DAG that is the single ordering that can contribute any path.
+    Returns None if any name is not in the graph.
+    """
+    ids = compiled['ids']
+    if any(name not in ids for name in [source, target, *checkpoints]):
+        return None
+    position = compiled['position']
+    stops = sorted({ids[name] for name in checkpoints}, key=position.__getitem__)
+    return [ids[source], *stops, ids[target]]
+
+def segment_product(compiled, stops, segment_count, modulus=None):
+    """
+    Multiplies segment_count(a, b) over consecutive stops, reduced modulo
+    modulus if given. Returns 0 as soon as a stop comes before the previous
+    one in topological order or a segment has no paths.
+    """
+    if stops is None:
+        return 0
+    position = compiled['position']
+    if any(position[a] > position[b] for a, b in zip(stops, stops[1:])):
+        return 0
+    total = 1
+    for a, b in zip(stops, stops[1:]):
+        total *= segment_count(a, b)
+        if modulus is not None:
+            total %= modulus
+        if total == 0:
+            return 0
+    return total
+
+def count_paths_factorized(compiled, source, target, checkpoints):
+    """
+    Counts paths from source to target that visit every checkpoint by
+    multiplying segment counts:
+    paths(source, c1) * paths(c1, c2) * ... * paths(ck, target).
+    """
+    stops = checkpoint_stops(compiled, source, target, checkpoints)
+    return segment_product(compiled, stops, lambda a, b: path_counts_from(compiled, a)[b])
 
-    def solve(node, checkpoints_to_visit):
-        state = (node, checkpoints_to_visit)
-        if state in memo:
-            return memo[state]
+def count_paths_through(compiled, source, target, checkpoints):
+    """
+    Counts paths from source to target that visit every checkpoint (the
+    source itself counts as visited). Each node carries one count per subset
+    of visited checkpoints, pushed forward along the topological order.
+    """
+    ids = compiled['ids']
+    if source not in ids or target not in ids:
+        return 0
+    offsets, targets = compiled['offsets'], compiled['targets']
+    # A repeated checkpoint is one node, so it gets a single bit
+    checkpoints = list(dict.fromkeys(checkpoints))
 
-        if node == 'out':
-            # A path is valid only if it ends at 'out' AND all checkpoints have been visited.
-            return 1 if not checkpoints_to_visit else 0
+    bits = {ids[name]: 1 << k for k, name in enumerate(checkpoints) if name in ids}
+    if len(bits) < len(set(checkpoints)):
+        return 0
+    n_masks = 1 << len(checkpoints)
 
-        total_paths = 0
-        for neighbor in graph.get(node, []):
-            new_checkpoints = checkpoints_to_visit
-            if neighbor in new_checkpoints:
-                new_checkpoints = new_checkpoints - {neighbor}
-            total_paths += solve(neighbor, new_checkpoints)
-        
-        memo[state] = total_paths
-        return total_paths
+    counts = [None] * len(compiled['names'])
+    start = [0] * n_masks
+    start[bits.get(ids[source], 0)] = 1
+    counts[ids[source]] = start
+    for u in compiled['order']:
+        vec = counts[u]
+        if vec is None:
+            continue
+        for v in targets[offsets[u]:offsets[u + 1]]:
+            bit = bits.get(v, 0)
+            dest = counts[v]
+            if dest is None:
+                dest = counts[v] = [0] * n_masks
+            for mask, c in enumerate(vec):
+                if c:
+                    dest[mask | bit] += c
 
-    return solve('svr', checkpoints)
+    final = counts[ids[target]]
+    return final[n_masks - 1] if final is not None else 0
+
+def path_counts_to(compiled, target):
+    """
+    Returns the number of paths from every node to node ID target, computed
+    in one backward pass over the topological order and cached per target.
+    """
+    key = ('to', target)
+    vectors = compiled['vectors']
+    if key in vectors:
+        return vectors[key]
+    offsets, targets, order = compiled['offsets'], compiled['targets'], compiled['order']
+
+    counts = [0] * len(compiled['names'])
+    counts[target] = 1
+    for k in range(compiled['position'][target] - 1, -1, -1):
+        u = order[k]
+        c = 0
+        for v in targets[offsets[u]:offsets[u + 1]]:
+            c += counts[v]
+        counts[u] = c
+    vectors[key] = counts
+    return counts
+
+def compute_reachability(compiled):
+    """
+    Stores, for every node, an int bitset of the node IDs reachable from it
+    (itself included), built in reverse topological order.
+    """
+    offsets, targets = compiled['offsets'], compiled['targets']
+    descendants = [0] * len(compiled['names'])
+    for u in reversed(compiled['order']):
+        reach = 1 << u
+        for v in targets[offsets[u]:offsets[u + 1]]:
+            reach |= descendants[v]
+        descendants[u] = reach
+    compiled['descendants'] = descendants
+    return descendants
+
+def load_query_graph(filename="input.txt", targets=()):
+    """
+    Loads a graph once for repeated queries: compiles it, computes the
+    reachability bitsets and precomputes count vectors for the given targets
+    (every sink when none are given).
+    """
+    compiled = compile_graph(parse_input(filename))
+    compute_reachability(compiled)
+    offsets, ids = compiled['offsets'], compiled['ids']
+    if targets:
+        warm = [ids[name] for name in targets if name in ids]
+    else:
+        warm = [u for u in range(len(compiled['names'])) if offsets[u] == offsets[u + 1]]
+    for t in warm:
+        path_counts_to(compiled, t)
+    return compiled
+
+def answer_query(compiled, source, target, checkpoints=()):
+    """
+    Counts paths from source to target visiting every checkpoint, using the
+    reachability bitsets to reject impossible queries before any counting.
+    """
+    stops = checkpoint_stops(compiled, source, target, checkpoints)
+    if stops is None:
+        return 0
+    descendants = compiled.get('descendants') or compute_reachability(compiled)
+    for a, b in zip(stops, stops[1:]):
+        if not descendants[a] >> b & 1:
+            return 0
+    return segment_product(compiled, stops, lambda a, b: path_counts_to(compiled, b)[a])
+
+def run_queries(compiled, lines):
+    """
+    Answers one query per line: 'source target [checkpoint ...]'. Blank lines
+    and lines starting with '#' are skipped. Yields
+    (source, target, checkpoints, count, seconds) per query.
+    """
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        source, target, *checkpoints = line.split()
+        start = time.perf_counter()
+        count = answer_query(compiled, source, target, checkpoints)
+        yield source, target, checkpoints, count, time.perf_counter() - start
+
+def compute_levels(compiled):
+    """
+    Groups the edges by the longest-path level of their source node, so all
+    edges leaving one level can be pushed forward together. Stores the edge
+    arrays sorted by level plus the boundaries of each level.
+    """
+    offsets = np.frombuffer(compiled['offsets'], dtype=np.int32)
+    targets = np.frombuffer(compiled['targets'], dtype=np.int32)
+    n = len(compiled['names'])
+
+    level = [0] * n
+    for u in compiled['order']:
+        for v in compiled['targets'][compiled['offsets'][u]:compiled['offsets'][u + 1]]:
+            if level[v] <= level[u]:
+                level[v] = level[u] + 1
+    level = np.array(level, dtype=np.int64)
+
+    edge_src = np.repeat(np.arange(n), np.diff(offsets))
+    by_level = np.argsort(level[edge_src], kind='stable')
+    edge_src = edge_src[by_level]
+    edge_dst = targets[by_level].astype(np.int64)
+    bounds = np.searchsorted(level[edge_src], np.arange(int(level.max(initial=0)) + 2))
+
+    compiled['levels'] = {
+        'level': level,
+        'edge_src': edge_src,
+        'edge_dst': edge_dst,
+        'bounds': bounds,
+        'max_indegree': int(np.bincount(edge_dst, minlength=1).max(initial=0)),
+    }
+    return compiled['levels']
+
+def path_counts_vectorized(compiled, source, modulus=None):
+    """
+    Counts paths from node ID source to every node with one NumPy scatter-add
+    per level. With a modulus the counts are reduced after every level and
+    stay in int64. Without one the counts are exact in int64 as long as the
+    next level cannot overflow; otherwise this falls back to the big-int
+    path_counts_from and returns an object array.
+    """
+    levels = compiled.get('levels') or compute_levels(compiled)
+    edge_src, edge_dst, bounds = levels['edge_src'], levels['edge_dst'], levels['bounds']
+    fan_in = max(levels['max_indegree'], 1)
+    limit = np.iinfo(np.int64).max // fan_in
+    if modulus is not None and modulus - 1 > limit:
+        raise ValueError(f"modulus {modulus} is too large for int64 with in-degree {fan_in}")
+
+    counts = np.zeros(len(compiled['names']), dtype=np.int64)
+    counts[source] = 1
+    for L in range(int(levels['level'][source]), len(bounds) - 1):
+        lo, hi = bounds[L], bounds[L + 1]
+        if lo == hi:
+            continue
+        contributions = counts[edge_src[lo:hi]]
+        if modulus is None and contributions.max() > limit:
+            return np.array(path_counts_from(compiled, source), dtype=object)
+        np.add.at(counts, edge_dst[lo:hi], contributions)
+        if modulus is not None:
+            counts[edge_dst[lo:hi]] %= modulus
+    return counts
+
+def count_paths_fixed_width(compiled, source, target, checkpoints=(), modulus=None):
+    """
+    Same answer as count_paths_factorized (reduced modulo modulus if given),
+    but every segment count comes from path_counts_vectorized.
+    """
+    stops = checkpoint_stops(compiled, source, target, checkpoints)
+    return segment_product(compiled, stops,
+                           lambda a, b: int(path_counts_vectorized(compiled, a, modulus)[b]),
+                           modulus)
+
+def part1(graph):
+    """
+    Solves Part 1: How many different paths lead from 'you' to 'out'?
+    """
+    return count_paths(compile_graph(graph), 'you', 'out')
+
+def part2(graph, checkpoints=('dac', 'fft'), method='factorized'):
+    """
+    Solves Part 2: How many paths from 'svr' to 'out' visit both 'dac' and 'fft'?
+    method='factorized' multiplies segment counts between checkpoints;
+    method='mask' tracks every subset of visited checkpoints per node.
+    """
+    compiled = compile_graph(graph)
+    if method == 'factorized':
+        return count_paths_factorized(compiled, 'svr', 'out', list(checkpoints))
+    if method == 'mask':
+        return count_paths_through(compiled, 'svr', 'out', list(checkpoints))
+    raise ValueError(f"Unknown method: {method}")
 
 
 if __name__ == "__main__":
-    graph = parse_input()
+    parser = argparse.ArgumentParser(description="Count device paths for day 11.")
+    parser.add_argument("--input", default="input.txt")
+    parser.add_argument("--checkpoints", nargs="*", default=["dac", "fft"],
+                        help="nodes every Part 2 path must visit")
+    parser.add_argument("--queries", metavar="FILE",
+                        help="answer 'source target [checkpoint ...]' lines from FILE ('-' for stdin)")
+    parser.add_argument("--modulus", type=int,
+                        help="count paths modulo this prime with the vectorized int64 engine")
+    args = parser.parse_args()
+
+    if args.modulus:
+        compiled = compile_graph(parse_input(args.input))
+        print(f"Part 1 (mod {args.modulus}): {count_paths_fixed_width(compiled, 'you', 'out', modulus=args.modulus)}")
+        print(f"Part 2 (mod {args.modulus}): "
+              f"{count_paths_fixed_width(compiled, 'svr', 'out', args.checkpoints, args.modulus)}")
+        sys.exit(0)
+
+    if args.queries:
+        start = time.perf_counter()
+        compiled = load_query_graph(args.input)
+        print(f"Loaded {len(compiled['names'])} nodes in {(time.perf_counter() - start) * 1000:.2f} ms")
+        query_file = sys.stdin if args.queries == "-" else open(args.queries)
+        with query_file:
+            for source, target, checkpoints, count, seconds in run_queries(compiled, query_file):
+                via = f" via {','.join(checkpoints)}" if checkpoints else ""
+                print(f"{source} -> {target}{via}: {count} ({seconds * 1000:.3f} ms)")
+        sys.exit(0)
+
+    graph = parse_input(args.input)
     
     # --- Part 1 ---
     result_part1 = part1(graph)
     print(f"Part 1: {result_part1}")
 
     # --- Part 2 ---
-    result_part2 = part2(graph)
-    print(f"Part 2: {result_part2}")
\ No newline at end of file
+    result_part2 = part2(graph, args.checkpoints)
+    print(f"Part 2: {result_part2}")
@@ -1,4 +1,11 @@
+import argparse
+import hashlib
+import json
+import os
 import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 
 def parse_input(content):
     """Parses the input file into shapes and regions."""
@@ -19,7 +26,8 @@ def parse_input(content):
         shape_id = int(lines[0].split(':')[0])
         shape_drawing = lines[1:]
         area = sum(line.count('#') for line in shape_drawing)
-        shapes[shape_id] = {'id': shape_id, 'area': area}
+        cells = [(r, c) for r, line in enumerate(shape_drawing) for c, ch in enumerate(line) if ch == '#']
+        shapes[shape_id] = {'id': shape_id, 'area': area, 'cells': cells}
 
     # Parse regions and their requirements
     regions = []
@@ -37,42 +45,289 @@ def parse_input(content):
         })
     return shapes, regions
 
+def shape_orientations(cells):
+    """Returns every distinct rotation and flip of a shape, each normalized to (0, 0)."""
+    orientations = set()
+    current = list(cells)
+    for _ in range(4):
+        current = [(c, -r) for r, c in current]
+        for variant in (current, [(r, -c) for r, c in current]):
+            min_r = min(r for r, _ in variant)
+            min_c = min(c for _, c in variant)
+            orientations.add(tuple(sorted((r - min_r, c - min_c) for r, c in variant)))
+    return sorted(orientations)
+
+def build_placements(shapes, width, height):
+    """
+    Precomputes every placement of every shape in a width x height region as a
+    bitmask (bit r * width + c), indexed by shape and by the placement's lowest
+    cell.
+    """
+    placements = {}
+    for shape_id, shape in shapes.items():
+        by_cell = {}
+        for orientation in shape_orientations(shape['cells']):
+            rows = max(r for r, _ in orientation) + 1
+            cols = max(c for _, c in orientation) + 1
+            base = 0
+            for r, c in orientation:
+                base |= 1 << (r * width + c)
+            for r0 in range(height - rows + 1):
+                for c0 in range(width - cols + 1):
+                    mask = base << (r0 * width + c0)
+                    by_cell.setdefault((mask & -mask).bit_length() - 1, []).append(mask)
+        placements[shape_id] = by_cell
+    return placements
+
+def presents_area(shapes, region):
+    """Total number of cells the region's presents cover."""
+    return sum(count * shapes[shape_id]['area'] for shape_id, count in enumerate(region['counts']))
+
+def fits_in_boxes(shapes, region):
+    """True if every present gets its own bounding box in a simple grid of boxes."""
+    used = [shapes[shape_id] for shape_id, count in enumerate(region['counts']) if count]
+    if not used:
+        return True
+    box_h = max(max(r for r, _ in shape['cells']) + 1 for shape in used)
+    box_w = max(max(c for _, c in shape['cells']) + 1 for shape in used)
+    total = sum(region['counts'])
+    w, h = region['width'], region['height']
+    return max((w // box_w) * (h // box_h), (w // box_h) * (h // box_w)) >= total
+
+class SearchTimeout(Exception):
+    """Raised by pack_presents when its deadline passes."""
+
+def can_pack_region(shapes, region, deadline=None):
+    """
+    Decides whether all presents fit in the region without overlapping.
+    The area check rejects and the box-grid check accepts in O(1); anything
+    left goes to pack_presents.
+    """
+    region_area = region['width'] * region['height']
+    if presents_area(shapes, region) > region_area:
+        return False
+    if fits_in_boxes(shapes, region):
+        return True
+    return pack_presents(shapes, region, deadline)
+
+def pack_presents(shapes, region, deadline=None):
+    """
+    Bitboard backtracking. The board is one int; the first empty cell must be
+    either covered by a placement whose lowest cell it is, or left empty, which
+    spends one cell of the slack (region area minus presents area). Presents
+    of the same shape are interchangeable, so branching is per shape, and
+    (board, counts) states already proven dead are remembered.
+
+    Each node keeps the placements that still fit, filtered from its parent's
+    list, and a branch is cut when more empty cells than the remaining slack
+    can no longer be covered by any of them.
+
+    deadline is a time.perf_counter() value; once it passes the search
+    raises SearchTimeout.
+    """
+    width, height = region['width'], region['height']
+    placements = build_placements(shapes, width, height)
+    shape_ids = [shape_id for shape_id, count in enumerate(region['counts']) if count]
+    full = (1 << (width * height)) - 1
+    dead = set()
+    nodes = [0]
+
+    def search(board, counts, slack, viable):
+        if not any(counts):
+            return True
+        state = (board, counts)
+        if state in dead:
+            return False
+
+        nodes[0] += 1
+        if deadline is not None and nodes[0] % 1024 == 0 and time.perf_counter() > deadline:
+            raise SearchTimeout
+
+        viable = [(k, mask) for k, mask in viable if counts[k] and not board & mask]
+        coverable = 0
+        for _, mask in viable:
+            coverable |= mask
+        if (full & ~board & ~coverable).bit_count() > slack:
+            dead.add(state)
+            return False
+
+        cell_bit = ~board & (board + 1)
+        for k, mask in viable:
+            # Placements are sorted by lowest cell, so the ones starting at the
+            # first empty cell come first
+            if not mask & cell_bit:
+                if mask & (cell_bit - 1) == 0:
+                    break
+                continue
+            remaining = counts[:k] + (counts[k] - 1,) + counts[k + 1:]
+            if search(board | mask, remaining, slack, viable):
+                return True
+        if slack > 0 and board | cell_bit != full:
+            if search(board | cell_bit, counts, slack - 1, viable):
+                return True
+
+        dead.add(state)
+        return False
+
+    viable = sorted(((k, mask) for k, shape_id in enumerate(shape_ids)
+                     for masks in placements[shape_id].values() for mask in masks),
+                    key=lambda item: (item[1] & -item[1], item[0]))
+    counts = tuple(region['counts'][shape_id] for shape_id in shape_ids)
+    slack = width * height - presents_area(shapes, region)
+    return search(0, counts, slack, viable)
+
+def shapes_signature(shapes):
+    """Stable digest of the shape set that does not depend on how shapes are drawn."""
+    canonical = [(shape_id, min(shape_orientations(shapes[shape_id]['cells']))) for shape_id in sorted(shapes)]
+    return hashlib.sha1(repr(canonical).encode()).hexdigest()[:16]
+
+def region_key(signature, region):
+    """Canonical cache key: a region and its 90 degree rotation share one key."""
+    short, long = sorted((region['width'], region['height']))
+    counts = ','.join(map(str, region['counts']))
+    return f"{signature}|{short}x{long}|{counts}"
+
+class RegionCache:
+    """
+    Memo of feasibility results keyed by region_key, with hit/miss counters.
+    Timeouts are never stored. With a path the cache is loaded from and saved
+    to a JSON file so results carry over between runs and input files.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.results = {}
+        self.hits = 0
+        self.misses = 0
+        if path and os.path.exists(path):
+            with open(path) as f:
+                self.results = json.load(f)
+
+    def get(self, key):
+        if key in self.results:
+            self.hits += 1
+            return 'solvable' if self.results[key] else 'unsolvable'
+        self.misses += 1
+        return None
+
+    def put(self, key, status):
+        if status != 'timeout':
+            self.results[key] = status == 'solvable'
+
+    def save(self):
+        if self.path:
+            with open(self.path, 'w') as f:
+                json.dump(self.results, f)
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+def evaluate_region(shapes, region, time_budget=None):
+    """Returns ('solvable' | 'unsolvable' | 'timeout', seconds) for one region."""
+    start = time.perf_counter()
+    deadline = start + time_budget if time_budget else None
+    try:
+        status = 'solvable' if can_pack_region(shapes, region, deadline) else 'unsolvable'
+    except SearchTimeout:
+        status = 'timeout'
+    return status, time.perf_counter() - start
+
+def evaluate_regions(shapes, regions, workers=None, time_budget=10.0, cache=None):
+    """
+    Evaluates all regions across a process pool, giving each region at most
+    time_budget seconds of search. Returns one (status, seconds) per region,
+    in input order.
+
+    With a RegionCache, regions whose key is cached (or repeats an earlier
+    region in this batch) are answered without searching and report 0 seconds.
+    """
+    if cache is None:
+        pending = list(range(len(regions)))
+        keys = None
+    else:
+        signature = shapes_signature(shapes)
+        keys = [region_key(signature, region) for region in regions]
+        pending = []
+        first_with_key = {}
+        for i, key in enumerate(keys):
+            if key in first_with_key:
+                cache.hits += 1
+            elif cache.get(key) is None:
+                first_with_key[key] = i
+                pending.append(i)
+
+    evaluate = partial(evaluate_region, shapes, time_budget=time_budget)
+    todo = [regions[i] for i in pending]
+    if workers == 1:
+        solved = [evaluate(region) for region in todo]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            solved = list(pool.map(evaluate, todo, chunksize=max(1, len(todo) // 256)))
+
+    if cache is None:
+        return solved
+
+    fresh = {}
+    for i, (status, seconds) in zip(pending, solved):
+        cache.put(keys[i], status)
+        fresh[i] = (status, seconds)
+    results = []
+    for i, key in enumerate(keys):
+        if i in fresh:
+            results.append(fresh[i])
+        else:
+            # Cached now, or shares its key with a region that just timed out
+            status = cache.results.get(key)
+            results.append(('timeout' if status is None else 'solvable' if status else 'unsolvable', 0.0))
+    return results
+
 def main():
     """Main function to solve the puzzle."""
+    parser = argparse.ArgumentParser(description="Count the regions that can hold their presents.")
+    parser.add_argument("--input", default="input.txt")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (1 runs serially)")
+    parser.add_argument("--time-budget", type=float, default=10.0, help="seconds of search per region")
+    parser.add_argument("--cache", metavar="FILE", help="JSON file to load and save region results")
+    args = parser.parse_args()
+
     try:
-        with open("input.txt") as f:
+        with open(args.input) as f:
             content = f.read()
     except FileNotFoundError:
-        print("Error: input.txt not found.")
+        print(f"Error: {args.input} not found.")
         return
 
     shapes, regions = parse_input(content)
     
-    solvable_by_area_count = 0
     total_regions = len(regions)
     print(f"Found {len(shapes)} shapes and {total_regions} regions.")
 
-    for i, region in enumerate(regions):
-        region_area = region['width'] * region['height']
-        
-        presents_area = 0
-        for shape_id, count in enumerate(region['counts']):
-            presents_area += count * shapes[shape_id]['area']
-            
-        print(f"Region {i+1} ({region['width']}x{region['height']}): Region Area = {region_area}, Presents Area = {presents_area}")
-
-        if presents_area <= region_area:
-            solvable_by_area_count += 1
-            print("  -> PASSED area check.")
-        else:
-            print("  -> FAILED area check.")
+    cache = RegionCache(args.cache)
+    start = time.perf_counter()
+    results = evaluate_regions(shapes, regions, args.workers, args.time_budget, cache)
+    elapsed = time.perf_counter() - start
+    cache.save()
 
-    print(f"\nBased on the area check, {solvable_by_area_count} out of {total_regions} regions might be solvable.")
-    print("\nThis problem is a complex packing puzzle. A simple area check is not enough to guarantee a solution.")
-    print("However, if the total area of presents is larger than the region, it's definitely impossible.")
-    print("The number of regions that pass the area check is the upper bound on the number of solvable regions.")
-    print(f"Final Answer (based on area check): {solvable_by_area_count}")
+    solvable_by_area_count = sum(presents_area(shapes, region) <= region['width'] * region['height']
+                                 for region in regions)
+    tally = {'solvable': 0, 'unsolvable': 0, 'timeout': 0}
+    for status, _ in results:
+        tally[status] += 1
+    slowest = max(range(total_regions), key=lambda i: results[i][1], default=None)
 
+    print(f"\nBased on the area check, {solvable_by_area_count} out of {total_regions} regions might be solvable.")
+    print(f"Packing search ({elapsed:.2f}s): {tally['solvable']} solvable, "
+          f"{tally['unsolvable']} unsolvable, {tally['timeout']} timed out.")
+    if slowest is not None:
+        region = regions[slowest]
+        print(f"Slowest region: {slowest+1} ({region['width']}x{region['height']}) "
+              f"took {results[slowest][1]:.3f}s")
+    print(f"Region cache: {cache.hits} hits, {cache.misses} misses ({cache.hit_rate():.1%} hit rate)")
+    timed_out = [i + 1 for i, (status, _) in enumerate(results) if status == 'timeout']
+    if timed_out:
+        print(f"Timed out regions: {timed_out}")
+    print(f"Final Answer: {tally['solvable']}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,109 @@
+import os
+import tempfile
+import unittest
+
+from solution import (RegionCache, can_pack_region, evaluate_regions, fits_in_boxes, pack_presents,
+                      parse_input, region_key, shapes_signature)
+
+EXAMPLE = """0:
+###
+##.
+##.
+
+1:
+###
+##.
+.##
+
+2:
+.##
+###
+##.
+
+3:
+##.
+###
+##.
+
+4:
+###
+#..
+###
+
+5:
+###
+.#.
+###
+
+4x4: 0 0 0 0 2 0
+12x5: 1 0 1 0 2 2
+12x5: 1 0 1 0 3 2
+"""
+
+class TestPacking(unittest.TestCase):
+    def setUp(self):
+        self.shapes, self.regions = parse_input(EXAMPLE)
+
+    def test_example(self):
+        """The first two example regions fit, the third does not."""
+        self.assertEqual([can_pack_region(self.shapes, region) for region in self.regions],
+                         [True, True, False])
+
+    def test_full_search(self):
+        """The example regions need the search, which gives the same answers."""
+        self.assertFalse(any(fits_in_boxes(self.shapes, region) for region in self.regions))
+        self.assertEqual([pack_presents(self.shapes, region) for region in self.regions],
+                         [True, True, False])
+
+    def test_box_grid(self):
+        """Regions that fit one present per box are accepted without searching."""
+        region = {'width': 6, 'height': 7, 'counts': [1, 1, 1, 1, 0, 0]}
+        self.assertTrue(fits_in_boxes(self.shapes, region))
+        self.assertTrue(can_pack_region(self.shapes, region))
+        self.assertTrue(pack_presents(self.shapes, region))
+        crowded = {'width': 6, 'height': 5, 'counts': [1, 1, 1, 1, 1, 0]}
+        self.assertFalse(fits_in_boxes(self.shapes, crowded))
+
+class TestRegionCache(unittest.TestCase):
+    def setUp(self):
+        self.shapes, self.regions = parse_input(EXAMPLE)
+
+    def test_hits_and_misses(self):
+        """Repeated and rotated regions are answered from the cache."""
+        regions = self.regions[:2] + [self.regions[0],
+                                      {'width': 5, 'height': 12, 'counts': self.regions[1]['counts']}]
+        cache = RegionCache()
+        results = evaluate_regions(self.shapes, regions, workers=1, cache=cache)
+        self.assertEqual([status for status, _ in results], ['solvable'] * 4)
+        self.assertEqual((cache.hits, cache.misses), (2, 2))
+        self.assertEqual(cache.hit_rate(), 0.5)
+
+    def test_timeouts_not_stored(self):
+        """Timed-out regions are searched again next time."""
+        cache = RegionCache()
+        key = region_key(shapes_signature(self.shapes), self.regions[2])
+        cache.put(key, 'timeout')
+        self.assertIsNone(cache.get(key))
+        cache.put(key, 'unsolvable')
+        self.assertEqual(cache.get(key), 'unsolvable')
+
+    def test_persistence(self):
+        """A saved cache answers every region of the next run."""
+        fd, path = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+        os.remove(path)
+        try:
+            cache = RegionCache(path)
+            evaluate_regions(self.shapes, self.regions[:2], workers=1, cache=cache)
+            cache.save()
+
+            reloaded = RegionCache(path)
+            results = evaluate_regions(self.shapes, self.regions[:2], workers=1, cache=reloaded)
+            self.assertEqual([status for status, _ in results], ['solvable', 'solvable'])
+            self.assertEqual((reloaded.hits, reloaded.misses), (2, 0))
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
+
+if __name__ == '__main__':
+    unittest.main()
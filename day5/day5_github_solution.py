@@ -1,9 +1,20 @@
 #!/usr/bin/env python3
+import argparse
+import heapq
+import os
+import tempfile
+from bisect import bisect_right
+from collections import Counter
 
-def part2(data):
-    blank = data.index("")
-    ranges = sorted([list(map(int, i.split("-"))) for i in data[:blank]])
+import numpy as np
+
+
+def parse_ranges(lines):
+    return sorted([list(map(int, i.split("-"))) for i in lines])
 
+
+def merge_ranges(ranges):
+    """Merge sorted [start, end] ranges into disjoint ones."""
     merged = [ranges[0]]
     for x2, y2 in ranges[1:]:
         x1, y1 = merged[-1]
@@ -11,13 +22,307 @@ def part2(data):
             merged.append([x2, y2])
         else:
             merged[-1][1] = max(y1, y2)
+    return merged
+
+
+def coalesce(ranges):
+    """Merge a stream of (start, end) ranges sorted by start, yielding disjoint ones."""
+    current = None
+    for x2, y2 in ranges:
+        if current is None:
+            current = [x2, y2]
+        elif x2 > current[1]:
+            yield tuple(current)
+            current = [x2, y2]
+        else:
+            current[1] = max(current[1], y2)
+    if current is not None:
+        yield tuple(current)
+
+
+def read_range_lines(f):
+    """Yield (start, end) from the range section of an open input file."""
+    for line in f:
+        line = line.strip()
+        if not line:
+            return
+        x, y = line.split("-")
+        yield int(x), int(y)
+
+
+def write_run(ranges, directory):
+    fd, path = tempfile.mkstemp(suffix='.run', dir=directory)
+    with os.fdopen(fd, 'w') as out:
+        for x, y in ranges:
+            out.write(f"{x}-{y}\n")
+    return path
+
+
+def read_run(path):
+    with open(path) as f:
+        yield from read_range_lines(f)
+
+
+def merge_runs(paths):
+    """k-way merge of sorted run files into one coalesced stream."""
+    return coalesce(heapq.merge(*(read_run(p) for p in paths)))
+
+
+def iter_merged_ranges_external(f, chunk_size=1_000_000, fan_in=128, tmpdir=None):
+    """Merged ranges from an input stream too large to sort in memory.
+
+    At most chunk_size ranges are held at once: each chunk is sorted,
+    coalesced and written to a temporary run, and the runs are then k-way
+    merged, at most fan_in files at a time. Yields (start, end) in order.
+    """
+    with tempfile.TemporaryDirectory(dir=tmpdir) as directory:
+        runs = []
+        chunk = []
+        for item in read_range_lines(f):
+            chunk.append(item)
+            if len(chunk) >= chunk_size:
+                chunk.sort()
+                runs.append(write_run(coalesce(chunk), directory))
+                chunk = []
+        if chunk:
+            chunk.sort()
+            runs.append(write_run(coalesce(chunk), directory))
+            chunk = []
+
+        while len(runs) > fan_in:
+            group, runs = runs[:fan_in], runs[fan_in:]
+            runs.append(write_run(merge_runs(group), directory))
+            for path in group:
+                os.remove(path)
+
+        yield from merge_runs(runs)
+
+
+def part2_external(filename, output=None, chunk_size=1_000_000, fan_in=128, tmpdir=None):
+    """Covered-ID count via iter_merged_ranges_external, optionally writing the merged ranges.
+
+    Returns (number of merged ranges, covered-ID count).
+    """
+    count = 0
+    total = 0
+    out = open(output, 'w') if output else None
+    try:
+        with open(filename) as f:
+            for x, y in iter_merged_ranges_external(f, chunk_size, fan_in, tmpdir):
+                count += 1
+                total += y - x + 1
+                if out:
+                    out.write(f"{x}-{y}\n")
+    finally:
+        if out:
+            out.close()
+    return count, total
+
+
+class FreshIndex:
+    """Membership index over merged fresh-ID ranges.
+
+    Single IDs are looked up with bisect and batches with one
+    np.searchsorted call, both O(log n) per ID.
+    """
+
+    def __init__(self, merged):
+        self.merged = merged
+        self.starts = np.array([x for x, _ in merged], dtype=np.int64)
+        self.ends = np.array([y for _, y in merged], dtype=np.int64)
+        self._starts = [x for x, _ in merged]
+
+    @classmethod
+    def from_lines(cls, lines):
+        return cls(merge_ranges(parse_ranges(lines)))
+
+    def __contains__(self, ingredient_id):
+        i = bisect_right(self._starts, ingredient_id) - 1
+        return i >= 0 and ingredient_id <= self.merged[i][1]
+
+    def contains_many(self, ids):
+        """Boolean array telling which of ids fall inside a fresh range."""
+        ids = np.asarray(ids, dtype=np.int64)
+        i = np.searchsorted(self.starts, ids, side='right') - 1
+        return (i >= 0) & (ids <= self.ends[np.maximum(i, 0)])
+
+    def count_fresh(self, ids):
+        return int(np.count_nonzero(self.contains_many(ids)))
+
+
+class IntervalSet:
+    """Mutable set of fresh-ID ranges with the covered count kept current.
+
+    Backed by a lazily allocated segment tree over the IDs lo..hi-1 that
+    stores, per node, how many inserted ranges cover it whole and how many
+    IDs below it are covered. add and remove are O(log(hi - lo)). Overlapping
+    ranges are counted separately, so removing one of them leaves the IDs
+    still covered by the others.
+    """
+
+    def __init__(self, lo=0, hi=1 << 60):
+        self.lo = lo
+        self.hi = hi
+        self._left = [-1]
+        self._right = [-1]
+        self._cover = [0]
+        self._covered = [0]
+        self._ranges = Counter()
+
+    def __len__(self):
+        """Number of ranges currently inserted, counting duplicates."""
+        return sum(self._ranges.values())
+
+    @property
+    def covered(self):
+        """Number of distinct IDs covered by at least one range."""
+        return self._covered[0]
+
+    def add(self, start, end):
+        """Insert the inclusive range start-end."""
+        self._check(start, end)
+        self._ranges[start, end] += 1
+        self._update(start, end + 1, 1)
+
+    def remove(self, start, end):
+        """Remove one previously inserted copy of start-end."""
+        if not self._ranges[start, end]:
+            del self._ranges[start, end]
+            raise KeyError(f"{start}-{end} is not in the set")
+        self._ranges[start, end] -= 1
+        if not self._ranges[start, end]:
+            del self._ranges[start, end]
+        self._update(start, end + 1, -1)
+
+    def __contains__(self, ingredient_id):
+        if not self.lo <= ingredient_id < self.hi:
+            return False
+        node, lo, hi = 0, self.lo, self.hi
+        while node != -1:
+            if self._cover[node]:
+                return True
+            mid = (lo + hi) // 2
+            if ingredient_id < mid:
+                node, hi = self._left[node], mid
+            else:
+                node, lo = self._right[node], mid
+        return False
+
+    def covered_in(self, start, end):
+        """Number of covered IDs inside the inclusive range start-end."""
+        return self._covered_in(0, self.lo, self.hi, max(start, self.lo), min(end + 1, self.hi))
+
+    def overlaps(self, start, end):
+        """Whether any ID in start-end is covered."""
+        return self.covered_in(start, end) > 0
+
+    def ranges(self):
+        """The covered IDs as sorted, disjoint inclusive [start, end] ranges."""
+        merged = []
+        stack = [(0, self.lo, self.hi)]
+        while stack:
+            node, lo, hi = stack.pop()
+            if node == -1 or not self._covered[node]:
+                continue
+            if self._cover[node]:
+                if merged and merged[-1][1] == lo - 1:
+                    merged[-1][1] = hi - 1
+                else:
+                    merged.append([lo, hi - 1])
+                continue
+            mid = (lo + hi) // 2
+            stack.append((self._right[node], mid, hi))
+            stack.append((self._left[node], lo, mid))
+        return merged
+
+    def _check(self, start, end):
+        if start > end:
+            raise ValueError(f"empty range {start}-{end}")
+        if start < self.lo or end >= self.hi:
+            raise ValueError(f"range {start}-{end} is outside {self.lo}-{self.hi - 1}")
+
+    def _new_node(self):
+        self._left.append(-1)
+        self._right.append(-1)
+        self._cover.append(0)
+        self._covered.append(0)
+        return len(self._cover) - 1
+
+    def _update(self, a, b, delta):
+        """Add delta to the cover count of the nodes that tile [a, b)."""
+        left, right, cover, covered = self._left, self._right, self._cover, self._covered
+        visited = []
+        stack = [(0, self.lo, self.hi)]
+        while stack:
+            node, lo, hi = stack.pop()
+            visited.append((node, lo, hi))
+            if a <= lo and hi <= b:
+                cover[node] += delta
+                continue
+            mid = (lo + hi) // 2
+            if a < mid:
+                if left[node] == -1:
+                    left[node] = self._new_node()
+                stack.append((left[node], lo, mid))
+            if b > mid:
+                if right[node] == -1:
+                    right[node] = self._new_node()
+                stack.append((right[node], mid, hi))
+
+        # Children were visited after their parents, so recompute in reverse
+        for node, lo, hi in reversed(visited):
+            if cover[node]:
+                covered[node] = hi - lo
+            else:
+                l, r = left[node], right[node]
+                covered[node] = (covered[l] if l != -1 else 0) + (covered[r] if r != -1 else 0)
+
+    def _covered_in(self, node, lo, hi, a, b):
+        if node == -1 or b <= lo or hi <= a or not self._covered[node]:
+            return 0
+        if self._cover[node]:
+            return min(hi, b) - max(lo, a)
+        if a <= lo and hi <= b:
+            return self._covered[node]
+        mid = (lo + hi) // 2
+        return (self._covered_in(self._left[node], lo, mid, a, b)
+                + self._covered_in(self._right[node], mid, hi, a, b))
+
+
+def part1(data):
+    blank = data.index("")
+    index = FreshIndex.from_lines(data[:blank])
+    ids = [int(i) for i in data[blank + 1:] if i]
+    return index.count_fresh(ids)
+
+
+def part2(data):
+    blank = data.index("")
+    merged = merge_ranges(parse_ranges(data[:blank]))
 
     total = sum(y - x + 1 for x, y in merged)
     return total
 
-# Read input
-with open('day5_input.txt', 'r') as f:
-    data = [line.strip() for line in f.readlines()]
 
-result = part2(data)
-print(f"Part 2 Answer: {result}")
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Day 5: fresh ingredient ranges')
+    parser.add_argument('--input', default='day5_input.txt', help='database file (default: day5_input.txt)')
+    parser.add_argument('--external', action='store_true',
+                        help='merge ranges with an external sort instead of in memory (part 2 only)')
+    parser.add_argument('--chunk-size', type=int, default=1_000_000,
+                        help='ranges sorted in memory per run (default: 1000000)')
+    parser.add_argument('--output', help='write the merged ranges here (external mode)')
+    args = parser.parse_args()
+
+    if args.external:
+        count, total = part2_external(args.input, args.output, args.chunk_size)
+        print(f"Merged ranges: {count}")
+        print(f"Part 2 Answer: {total}")
+    else:
+        # Read input
+        with open(args.input, 'r') as f:
+            data = [line.strip() for line in f.readlines()]
+
+        print(f"Part 1 Answer: {part1(data)}")
+        result = part2(data)
+        print(f"Part 2 Answer: {result}")
@@ -0,0 +1,138 @@
+import io
+import os
+import random
+import tempfile
+import unittest
+
+from day5_github_solution import (FreshIndex, IntervalSet, iter_merged_ranges_external,
+                                  merge_ranges, parse_ranges, part1, part2, part2_external)
+
+EXAMPLE = """3-5
+10-14
+16-20
+12-18
+
+1
+5
+8
+11
+17
+32"""
+
+def random_ranges(rng, count, span=60, length=8):
+    ranges = []
+    for _ in range(count):
+        start = rng.randint(0, span)
+        ranges.append((start, start + rng.randint(0, length)))
+    return ranges
+
+def covered_ids(ranges):
+    return {i for x, y in ranges for i in range(x, y + 1)}
+
+def as_ranges(ids):
+    """Sorted, disjoint inclusive ranges of a set of IDs."""
+    merged = []
+    for i in sorted(ids):
+        if merged and merged[-1][1] == i - 1:
+            merged[-1][1] = i
+        else:
+            merged.append([i, i])
+    return merged
+
+class TestFreshIndex(unittest.TestCase):
+    def test_example(self):
+        """The example has 3 fresh IDs and 14 covered IDs."""
+        data = EXAMPLE.split('\n')
+        self.assertEqual(part1(data), 3)
+        self.assertEqual(part2(data), 14)
+
+    def test_contains_matches_bruteforce(self):
+        """Single and batched lookups agree with per-ID membership."""
+        rng = random.Random(22)
+        for _ in range(100):
+            ranges = random_ranges(rng, rng.randint(1, 8))
+            fresh = covered_ids(ranges)
+            index = FreshIndex.from_lines([f"{x}-{y}" for x, y in ranges])
+            ids = list(range(-3, 75))
+            expected = [i in fresh for i in ids]
+            self.assertEqual([i in index for i in ids], expected)
+            self.assertEqual(index.contains_many(ids).tolist(), expected)
+            self.assertEqual(index.count_fresh(ids), sum(expected))
+
+class TestExternalMerge(unittest.TestCase):
+    def test_matches_part2(self):
+        """Tiny chunks and fan-in force several runs and merge passes."""
+        rng = random.Random(23)
+        for _ in range(30):
+            ranges = random_ranges(rng, rng.randint(1, 40), span=500, length=30)
+            lines = [f"{x}-{y}" for x, y in ranges]
+            text = '\n'.join(lines) + '\n\n1\n'
+            merged = list(iter_merged_ranges_external(io.StringIO(text), chunk_size=3, fan_in=2))
+            self.assertEqual([list(r) for r in merged], merge_ranges(parse_ranges(lines)))
+            self.assertEqual(covered_ids(merged), covered_ids(ranges))
+            self.assertEqual(sum(y - x + 1 for x, y in merged), part2(text.split('\n')))
+
+    def test_part2_external_writes_ranges(self):
+        """part2_external counts the merged ranges and writes them out."""
+        fd, path = tempfile.mkstemp(suffix='.txt')
+        output = path + '.out'
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(EXAMPLE + '\n')
+            self.assertEqual(part2_external(path, output, chunk_size=1, fan_in=2), (2, 14))
+            with open(output) as f:
+                self.assertEqual(f.read(), "3-5\n10-20\n")
+        finally:
+            os.remove(path)
+            if os.path.exists(output):
+                os.remove(output)
+
+class TestIntervalSet(unittest.TestCase):
+    def test_matches_bruteforce(self):
+        """Random adds and removes agree with a multiset of ranges."""
+        rng = random.Random(24)
+        for _ in range(40):
+            ids = IntervalSet(0, 100)
+            inserted = []
+            for _ in range(60):
+                if inserted and rng.random() < 0.4:
+                    r = inserted.pop(rng.randrange(len(inserted)))
+                    ids.remove(*r)
+                else:
+                    r = random_ranges(rng, 1, span=80, length=15)[0]
+                    inserted.append(r)
+                    ids.add(*r)
+                covered = covered_ids(inserted)
+                self.assertEqual(len(ids), len(inserted))
+                self.assertEqual(ids.covered, len(covered))
+                self.assertEqual(ids.ranges(), as_ranges(covered))
+                a = rng.randint(-5, 100)
+                b = a + rng.randint(0, 30)
+                self.assertEqual(ids.covered_in(a, b), len(covered & set(range(a, b + 1))))
+                self.assertEqual(ids.overlaps(a, b), bool(covered & set(range(a, b + 1))))
+                probe = rng.randint(-5, 105)
+                self.assertEqual(probe in ids, probe in covered)
+
+    def test_overlapping_remove(self):
+        """Removing one of two overlapping ranges keeps the other's IDs."""
+        ids = IntervalSet()
+        ids.add(3, 5)
+        ids.add(3, 5)
+        ids.add(4, 9)
+        ids.remove(3, 5)
+        self.assertEqual(ids.ranges(), [[3, 9]])
+        ids.remove(3, 5)
+        self.assertEqual((ids.covered, ids.ranges()), (6, [[4, 9]]))
+
+    def test_errors(self):
+        """Missing, empty and out-of-bounds ranges are rejected."""
+        ids = IntervalSet(0, 10)
+        with self.assertRaises(KeyError):
+            ids.remove(1, 2)
+        with self.assertRaises(ValueError):
+            ids.add(5, 4)
+        with self.assertRaises(ValueError):
+            ids.add(5, 10)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,83 @@
-def solve_worksheet(filename):
+import numpy as np
+
+# Largest number of decimal digits that always fits in a signed int64
+INT64_DIGITS = 18
+
+
+def longest_digit_run(text):
+    """Length of the longest run of decimal digits in text."""
+    chars = np.frombuffer(text.encode(), dtype=np.uint8)
+    breaks = np.flatnonzero((chars < ord('0')) | (chars > ord('9')))
+    runs = np.diff(np.concatenate(([-1], breaks, [len(chars)]))) - 1
+    return int(runs.max())
+
+
+def load_worksheet_array(number_lines, num_problems):
+    """Parse the number rows into a 2D array with one column per problem.
+
+    Uses int64 when every column product is guaranteed to fit, and falls back
+    to an object array of Python ints otherwise.
+    """
+    text = ' '.join(number_lines)
+    rows = len(number_lines)
+    max_digits = longest_digit_run(text)
+
+    if max_digits <= INT64_DIGITS:
+        values = np.fromstring(text, dtype=np.int64, sep=' ')
+    else:
+        values = np.array([int(t) for t in text.split()], dtype=object)
+    if len(values) != rows * num_problems:
+        raise ValueError(f"expected {rows} rows of {num_problems} numbers, got {len(values)}")
+
+    # A column result has at most rows * max_digits digits
+    if values.dtype != object and rows * max_digits > INT64_DIGITS:
+        values = values.astype(object)
+    return values.reshape(rows, num_problems)
+
+
+def exact_sum(values):
+    """Sum a 1D array as a Python int, without int64 overflow.
+
+    int64 values are split into 32-bit high and low limbs that are summed
+    separately, so the total can exceed int64 while staying vectorized.
+    """
+    if values.dtype == object:
+        return int(values.sum())
+    high = (values >> 32).sum()
+    low = (values & 0xFFFFFFFF).sum()
+    return (int(high) << 32) + int(low)
+
+
+def solve_worksheet_vectorized(filename):
+    """Same result as solve_worksheet, evaluated a whole operator class at a time.
+
+    All '+' columns are reduced with one sum and all '*' columns with one
+    product along the row axis.
+    """
+    with open(filename, 'r') as f:
+        lines = [line.strip() for line in f.readlines()]
+
+    return worksheet_total(lines)
+
+
+def worksheet_total(lines):
+    """Grand total of a worksheet given as its lines, operator line last."""
+    operators = np.array(lines[-1].split())
+    values = load_worksheet_array(lines[:-1], len(operators))
+
+    adds = operators == '+'
+    sums = values[:, adds].sum(axis=0)
+    products = values[:, ~adds].prod(axis=0)
+    return exact_sum(sums) + exact_sum(products)
+
+
+def solve_worksheet(filename, method='vectorized'):
+    """Grand total of the worksheet. method is 'vectorized' (default) or 'loop'."""
+    if method == 'vectorized':
+        return solve_worksheet_vectorized(filename)
+    if method != 'loop':
+        raise ValueError(f"unknown method: {method}")
+
     # Read the input
     with open(filename, 'r') as f:
         lines = [line.strip() for line in f.readlines()]
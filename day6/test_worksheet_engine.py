@@ -0,0 +1,74 @@
+import os
+import tempfile
+import unittest
+
+from solution import solve_worksheet
+from worksheet_engine import (STRATEGIES, cephalopod_total, load_worksheet, row_reading_total,
+                              solve_both, worksheet_masks)
+
+EXAMPLE = """123 328  51 64
+ 45 64  387 23
+  6 98  215 314
+*   +   *   +  """
+
+def write_worksheet(text):
+    fd, path = tempfile.mkstemp(suffix='.txt')
+    with os.fdopen(fd, 'w') as f:
+        f.write(text)
+    return path
+
+class TestWorksheetEngine(unittest.TestCase):
+    def check(self, text, part1, part2):
+        path = write_worksheet(text)
+        try:
+            for strategy in STRATEGIES:
+                result = solve_both(path, strategy)
+                self.assertEqual((result['part1'], result['part2']), (part1, part2), strategy)
+        finally:
+            os.remove(path)
+
+    def test_example(self):
+        """Both readings of the example, with every loading strategy."""
+        self.check(EXAMPLE, 4277556, 3263827)
+
+    def test_ragged_lines(self):
+        """Lines without trailing padding are read the same."""
+        ragged = '\n'.join(line.rstrip() for line in EXAMPLE.split('\n')) + '\n'
+        self.check(ragged, 4277556, 3263827)
+
+    def test_totals_past_int64(self):
+        """Products with more than 18 digits fall back to exact ints."""
+        text = "99999999999 1\n99999999999 2\n*           +\n"
+        self.check(text, 99999999999 ** 2 + 3, 99 ** 11 + 12)
+
+    def test_misaligned_worksheet(self):
+        """A shifted line merges problems, which is reported instead of summed."""
+        lines = EXAMPLE.split('\n')
+        lines[0] = ' ' + lines[0]
+        path = write_worksheet('\n'.join(lines) + '\n')
+        try:
+            grid = load_worksheet(path)
+        finally:
+            os.remove(path)
+        masks = worksheet_masks(grid)
+        with self.assertRaises(ValueError):
+            row_reading_total(grid, masks)
+        with self.assertRaises(ValueError):
+            cephalopod_total(grid, masks)
+
+    def test_timings(self):
+        """Every phase reports a wall time."""
+        path = write_worksheet(EXAMPLE)
+        try:
+            timings = solve_both(path)['timings']
+        finally:
+            os.remove(path)
+        self.assertEqual(set(timings), {'load', 'masks', 'part1', 'part2'})
+
+    def test_matches_row_reading_solution(self):
+        """Part 1 agrees with the row-splitting solution on the puzzle input."""
+        self.assertEqual(solve_both('input_correct.txt')['part1'],
+                         solve_worksheet('input_correct.txt'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,223 @@
+import argparse
+import time
+
+import numpy as np
+
+from solution import INT64_DIGITS, exact_sum
+
+STRATEGIES = ('read', 'mmap', 'text')
+
+SPACE, PLUS, STAR = ord(' '), ord('+'), ord('*')
+
+
+def load_byte_matrix(filename, mmap=False):
+    """Load the worksheet as a 2D uint8 array with one row per line.
+
+    When every line has the same length the result is a view of the file
+    buffer (memory-mapped if mmap is set); otherwise short lines are padded
+    with spaces into a new array.
+    """
+    if mmap:
+        data = np.memmap(filename, dtype=np.uint8, mode='r')
+    else:
+        data = np.fromfile(filename, dtype=np.uint8)
+
+    ends = np.flatnonzero(data == ord('\n'))
+    if len(ends) == 0 or ends[-1] != len(data) - 1:
+        ends = np.append(ends, len(data))
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    lengths = ends - starts
+    if len(lengths) and lengths[-1] == 0:
+        starts, lengths = starts[:-1], lengths[:-1]
+
+    rows = len(lengths)
+    width = int(lengths.max()) if rows else 0
+    if rows and np.all(lengths == width) and len(data) >= rows * (width + 1):
+        return data[:rows * (width + 1)].reshape(rows, width + 1)[:, :width]
+
+    matrix = np.full((rows, width), SPACE, dtype=np.uint8)
+    for row, (start, length) in enumerate(zip(starts, lengths)):
+        matrix[row, :length] = data[start:start + length]
+    return matrix
+
+
+def load_worksheet(filename, strategy='read'):
+    """Load the worksheet once as a column-major uint8 matrix shared by both readings.
+
+    'read' loads the file into memory with one call, 'mmap' memory-maps it,
+    and 'text' reads and pads lines the way the older scripts did.
+    """
+    if strategy == 'read':
+        grid = load_byte_matrix(filename)
+    elif strategy == 'mmap':
+        grid = load_byte_matrix(filename, mmap=True)
+    elif strategy == 'text':
+        with open(filename, 'rb') as f:
+            lines = [line.rstrip(b'\n') for line in f.readlines()]
+        width = max((len(line) for line in lines), default=0)
+        padded = b''.join(line.ljust(width, bytes([SPACE])) for line in lines)
+        grid = np.frombuffer(padded, dtype=np.uint8).reshape(len(lines), width)
+    else:
+        raise ValueError(f"unknown strategy: {strategy}")
+    # Both readings work column by column
+    return np.asfortranarray(grid)
+
+
+def worksheet_masks(grid):
+    """Per-cell and per-column masks that both readings are computed from.
+
+    Returns a dict with 'digits' (digit cells above their column's
+    operator), 'values' (digit values, 0 elsewhere), 'op_cols' (columns
+    holding an operator) and 'ops' (each column's first operator byte, or 0).
+    """
+    rows, width = grid.shape
+    is_op = (grid == PLUS) | (grid == STAR)
+    op_cols = is_op.any(axis=0)
+    first_op = np.where(op_cols, is_op.argmax(axis=0), rows)
+    # Digits below a column's operator are never read
+    digits = (grid >= ord('0')) & (grid <= ord('9'))
+    digits &= np.arange(rows)[:, None] < first_op
+    ops = np.zeros(width, dtype=np.uint8)
+    ops[op_cols] = grid[first_op[op_cols], np.flatnonzero(op_cols)]
+    return {
+        'digits': digits,
+        'values': np.where(digits, grid - ord('0'), 0),
+        'op_cols': op_cols,
+        'ops': ops,
+    }
+
+
+def evaluate_groups(numbers, present, starts, group_ops):
+    """Sum or multiply the present numbers of each group of consecutive columns.
+
+    numbers and present are (k, n) arrays whose n columns split into groups
+    at starts; group_ops holds each group's operator byte. The total is exact.
+    """
+    adds = group_ops == PLUS
+    stars = group_ops == STAR
+    sums = np.add.reduceat(np.where(present, numbers, 0), starts, axis=1).sum(axis=0)
+    products = np.multiply.reduceat(np.where(present, numbers, 1), starts, axis=1).prod(axis=0)
+    return exact_sum(sums[adds]) + exact_sum(products[stars])
+
+
+def problem_columns(masks):
+    """Non-blank columns and the offsets into them where each problem starts.
+
+    Problems are runs of columns between blank separator columns. Raises
+    ValueError unless every problem has exactly one operator column, which
+    catches worksheets whose lines are misaligned.
+    """
+    op_cols = masks['op_cols']
+    used = np.flatnonzero(masks['digits'].any(axis=0) | op_cols)
+    if len(used) == 0:
+        return used, used
+    starts = np.flatnonzero(np.diff(used, prepend=-2) > 1)
+    op_counts = np.add.reduceat(op_cols[used].astype(np.int64), starts)
+    bad = np.flatnonzero(op_counts != 1)
+    if len(bad):
+        col = int(used[starts[bad[0]]])
+        raise ValueError(f"problem at column {col} has {op_counts[bad[0]]} operators; "
+                         f"{len(bad)} of {len(starts)} problems are misaligned")
+    return used, starts
+
+
+def row_reading_total(grid, masks):
+    """Part 1 total: problems are runs of columns between blank separator columns,
+    and each row's digits inside a run form one number, read left to right.
+    """
+    used, starts = problem_columns(masks)
+    if len(used) == 0:
+        return 0
+    digits = masks['digits'][:, used]
+    values = masks['values'][:, used]
+
+    # Place value of a digit = digits to its right in the same row and problem
+    seen = np.cumsum(digits, axis=1)
+    ends = np.append(starts[1:], len(used)) - 1
+    problem_end = np.repeat(ends, np.diff(np.append(starts, len(used))))
+    place = seen[:, problem_end] - seen
+
+    counts = np.add.reduceat(digits, starts, axis=1)
+    dtype = np.int64 if counts.sum(axis=0).max() <= INT64_DIGITS else object
+    powers = np.array([10 ** k for k in range(int(place.max()) + 1)], dtype=dtype)
+    weights = powers[place]
+    numbers = np.add.reduceat(values.astype(dtype) * weights, starts, axis=1)
+
+    group_ops = np.maximum.reduceat(masks['ops'][used], starts)
+    return evaluate_groups(numbers, counts > 0, np.arange(len(starts)), group_ops)
+
+
+def cephalopod_total(grid, masks):
+    """Part 2 total: each column's digits form one number, read top to bottom,
+    and a column belongs to the nearest operator column at or to its left.
+    """
+    rows, width = grid.shape
+    problem_columns(masks)
+    digits, values = masks['digits'], masks['values']
+    counts = digits.sum(axis=0)
+    dtype = np.int64 if counts.max(initial=0) <= INT64_DIGITS else object
+
+    # Worksheets are a few rows by many columns, so build every column's
+    # number at once with Horner's rule, one row at a time
+    numbers = np.zeros(width, dtype=dtype)
+    for row in range(rows):
+        numbers = np.where(digits[row], numbers * 10 + values[row].astype(dtype), numbers)
+
+    owner = np.maximum.accumulate(np.where(masks['op_cols'], np.arange(width), -1))
+    keep = (counts > 0) & (owner >= 0)
+    if not keep.any():
+        return 0
+    numbers, owner, counts = numbers[keep], owner[keep], counts[keep]
+    starts = np.flatnonzero(np.diff(owner, prepend=-2))
+    if np.add.reduceat(counts, starts).max() > INT64_DIGITS:
+        numbers = numbers.astype(object)
+    present = np.ones((1, len(numbers)), dtype=bool)
+    return evaluate_groups(numbers[None, :], present, starts, masks['ops'][owner[starts]])
+
+
+def solve_both(filename, strategy='read'):
+    """Both worksheet totals from a single load of the input.
+
+    Returns a dict with 'part1', 'part2' and 'timings', which maps each
+    phase (load, masks, part1, part2) to its wall time in seconds.
+    """
+    timings = {}
+
+    started = time.perf_counter()
+    grid = load_worksheet(filename, strategy)
+    timings['load'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    masks = worksheet_masks(grid)
+    timings['masks'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    part1 = row_reading_total(grid, masks)
+    timings['part1'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    part2 = cephalopod_total(grid, masks)
+    timings['part2'] = time.perf_counter() - started
+
+    return {'part1': part1, 'part2': part2, 'timings': timings}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Day 6: both worksheet readings in one pass')
+    parser.add_argument('--input', default='input_correct.txt',
+                        help='worksheet file (default: input_correct.txt)')
+    parser.add_argument('--strategy', choices=STRATEGIES, default='read',
+                        help='how to load the worksheet (default: read)')
+    parser.add_argument('--timing', action='store_true', help='print per-phase timings')
+    args = parser.parse_args()
+
+    result = solve_both(args.input, args.strategy)
+    print(f"Part 1 grand total: {result['part1']}")
+    print(f"Part 2 grand total: {result['part2']}")
+    if args.timing:
+        for phase, seconds in result['timings'].items():
+            print(f"  {phase:<6} {seconds * 1000:9.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,9 @@
+import argparse
+import csv
+import time
+
+import numpy as np
+
 def parse_input(filename):
     with open(filename, 'r') as f:
         return [line.rstrip('\n') for line in f.readlines()]
@@ -9,6 +15,117 @@ def find_start(grid):
                 return (row, col)
     return None
 
+class RowStats:
+    """Per-row statistics collected by the sweep engines, one sample every `sample_every` rows.
+
+    Each sample is (row, active beams, splits in the row, bit length of the
+    largest timeline count, seconds spent on the row). The beam engine has no
+    timeline counts and records 0 there.
+    """
+
+    FIELDS = ('row', 'active', 'splits', 'magnitude_bits', 'seconds')
+
+    def __init__(self, sample_every=1):
+        if sample_every < 1:
+            raise ValueError("sample_every must be at least 1")
+        self.sample_every = sample_every
+        self.samples = []
+
+    def wants(self, row):
+        return row % self.sample_every == 0
+
+    def record(self, row, active, splits, magnitude_bits, seconds):
+        self.samples.append((row, active, splits, magnitude_bits, seconds))
+
+    def to_array(self):
+        dtype = [(name, np.int64) for name in self.FIELDS[:-1]] + [('seconds', np.float64)]
+        return np.array(self.samples, dtype=dtype)
+
+    def save(self, path):
+        """Write the samples to `path`: a structured array if it ends in .npy, CSV otherwise."""
+        if path.endswith('.npy'):
+            np.save(path, self.to_array())
+            return
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(self.FIELDS)
+            for row, active, splits, bits, seconds in self.samples:
+                writer.writerow((row, active, splits, bits, f"{seconds:.9f}"))
+
+# Byte table mapping '^' to '1' and every other byte to '0'
+SPLITTER_BITS = bytes(0x31 if b == ord('^') else 0x30 for b in range(256))
+
+def splitter_mask(line):
+    """Bitmask of the splitters in one row: bit c is set when column c is '^'."""
+    if isinstance(line, str):
+        line = line.encode()
+    return int(line.translate(SPLITTER_BITS)[::-1] or b'0', 2)
+
+def sweep_beams(start_col, width, rows, stats=None, first_row=0):
+    """Count splits for a beam entering at start_col, given the rows below the start.
+
+    If `stats` is a RowStats, sampled rows are recorded under their row
+    number, counting from `first_row`.
+    """
+    in_bounds = (1 << width) - 1
+
+    beams = 1 << start_col
+    split_count = 0
+    for row, line in enumerate(rows, first_row):
+        if not beams:
+            break
+        sampled = stats is not None and stats.wants(row)
+        if sampled:
+            started = time.perf_counter()
+        hit = beams & splitter_mask(line)
+        if hit:
+            split_count += hit.bit_count()
+            beams = (beams ^ hit) | (((hit << 1) | (hit >> 1)) & in_bounds)
+        if sampled:
+            stats.record(row, beams.bit_count(), hit.bit_count(), 0,
+                         time.perf_counter() - started)
+
+    return split_count
+
+def simulate_beams_bitset(grid, stats=None):
+    """Same result as simulate_beams, with the active beams kept as one int.
+
+    Each row's splitters become a bitmask, so a whole row is handled with a
+    few shifts and ANDs instead of a loop over the active beams.
+    """
+    start_pos = find_start(grid)
+    if not start_pos:
+        return 0
+
+    width = len(grid[0])
+    return sweep_beams(start_pos[1], width, grid[start_pos[0] + 1:],
+                       stats=stats, first_row=start_pos[0] + 1)
+
+def read_until_start(f):
+    """Read lines from a binary file until the one holding 'S'.
+
+    Returns (start row, start column, width of the first line), or
+    (None, None, width) if there is no start.
+    """
+    width = None
+    for row, line in enumerate(f):
+        line = line.rstrip(b'\n')
+        if width is None:
+            width = len(line)
+        col = line.find(b'S')
+        if col >= 0:
+            return row, col, width
+    return None, None, width
+
+def simulate_beams_stream(filename, stats=None):
+    """simulate_beams_bitset without loading the grid: the file is read one row at a time."""
+    with open(filename, 'rb') as f:
+        start_row, start_col, width = read_until_start(f)
+        if start_col is None:
+            return 0
+        return sweep_beams(start_col, width, (line.rstrip(b'\n') for line in f),
+                           stats=stats, first_row=start_row + 1)
+
 def simulate_beams(grid):
     start_pos = find_start(grid)
     if not start_pos:
@@ -52,12 +169,30 @@ def simulate_beams(grid):
     return split_count
 
 def main():
-    grid = parse_input('input.txt')
-    result = simulate_beams(grid)
+    parser = argparse.ArgumentParser(description='Day 7 part 1: count beam splits')
+    parser.add_argument('--input', default='input.txt', help='manifold file (default: input.txt)')
+    parser.add_argument('--stream', action='store_true',
+                        help='read the manifold row by row instead of loading it')
+    parser.add_argument('--stats', metavar='FILE',
+                        help='write per-row statistics to FILE (.npy or CSV)')
+    parser.add_argument('--sample-every', type=int, default=1, metavar='N',
+                        help='record statistics for every Nth row (default: 1)')
+    args = parser.parse_args()
+
+    stats = RowStats(args.sample_every) if args.stats else None
+    if args.stream:
+        result = simulate_beams_stream(args.input, stats=stats)
+    else:
+        result = simulate_beams_bitset(parse_input(args.input), stats=stats)
     print(f"The beam will be split {result} times")
+    if stats is not None:
+        stats.save(args.stats)
+        print(f"Wrote {len(stats.samples)} row samples to {args.stats}")
 
-    with open('answer.txt', 'w') as f:
-        f.write(str(result))
+    # Only the puzzle input's answer is recorded
+    if args.input == 'input.txt':
+        with open('answer.txt', 'w') as f:
+            f.write(str(result))
 
 if __name__ == '__main__':
     main()
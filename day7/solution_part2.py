@@ -1,3 +1,10 @@
+import argparse
+import time
+
+import numpy as np
+
+from solution import RowStats, read_until_start
+
 def parse_input(filename):
     with open(filename, 'r') as f:
         return [line.rstrip('\n') for line in f.readlines()]
@@ -9,6 +16,71 @@ def find_start(grid):
                 return (row, col)
     return None
 
+# A row can at most triple the largest column count (straight down plus
+# both split neighbours), so below this the next row still fits in int64
+INT64_SAFE = 1 << 61
+
+def sweep_timelines(start_col, width, rows, stats=None, first_row=0):
+    """Count timelines for a particle entering at start_col, given the rows below the start.
+
+    Only the per-column count vector is kept between rows. If `stats` is a
+    RowStats, sampled rows are recorded under their row number, counting
+    from `first_row`.
+    """
+    counts = np.zeros(width, dtype=np.int64)
+    counts[start_col] = 1
+    caret = ord('^')
+    for row, line in enumerate(rows, first_row):
+        sampled = stats is not None and stats.wants(row)
+        if sampled:
+            started = time.perf_counter()
+        if isinstance(line, str):
+            line = line.encode()
+        splits = 0
+        if caret in line:
+            splitters = np.frombuffer(line.ljust(width, b'.')[:width], dtype=np.uint8) == caret
+            hit = np.where(splitters, counts, 0)
+            if hit.any():
+                if counts.dtype != object and counts.max() >= INT64_SAFE:
+                    counts = counts.astype(object)
+                    hit = hit.astype(object)
+                counts = counts - hit
+                counts[:-1] += hit[1:]
+                counts[1:] += hit[:-1]
+                splits = int(np.count_nonzero(hit))
+        if sampled:
+            stats.record(row, int(np.count_nonzero(counts)), splits,
+                         int(counts.max()).bit_length(), time.perf_counter() - started)
+
+    # Summed as Python ints: the column total can exceed int64 even when
+    # every column fits
+    return sum(counts.tolist())
+
+def count_timelines_vectorized(grid, stats=None):
+    """Same result as count_timelines, with timeline counts as a NumPy column vector.
+
+    Each row is a boolean splitter mask; the counts that hit splitters are
+    shifted one column left and right and added back in a few vector ops.
+    Counts stay in int64 until the largest one gets close enough to overflow,
+    then switch to Python ints in an object array.
+    """
+    start_pos = find_start(grid)
+    if not start_pos:
+        return 0
+
+    width = len(grid[0])
+    return sweep_timelines(start_pos[1], width, grid[start_pos[0] + 1:],
+                           stats=stats, first_row=start_pos[0] + 1)
+
+def count_timelines_stream(filename, stats=None):
+    """count_timelines_vectorized without loading the grid: the file is read one row at a time."""
+    with open(filename, 'rb') as f:
+        start_row, start_col, width = read_until_start(f)
+        if start_col is None:
+            return 0
+        return sweep_timelines(start_col, width, (line.rstrip(b'\n') for line in f),
+                               stats=stats, first_row=start_row + 1)
+
 def count_timelines(grid):
     start_pos = find_start(grid)
     if not start_pos:
@@ -53,12 +125,30 @@ def count_timelines(grid):
     return total_timelines
 
 def main():
-    grid = parse_input('input.txt')
-    result = count_timelines(grid)
+    parser = argparse.ArgumentParser(description='Day 7 part 2: count particle timelines')
+    parser.add_argument('--input', default='input.txt', help='manifold file (default: input.txt)')
+    parser.add_argument('--stream', action='store_true',
+                        help='read the manifold row by row instead of loading it')
+    parser.add_argument('--stats', metavar='FILE',
+                        help='write per-row statistics to FILE (.npy or CSV)')
+    parser.add_argument('--sample-every', type=int, default=1, metavar='N',
+                        help='record statistics for every Nth row (default: 1)')
+    args = parser.parse_args()
+
+    stats = RowStats(args.sample_every) if args.stats else None
+    if args.stream:
+        result = count_timelines_stream(args.input, stats=stats)
+    else:
+        result = count_timelines_vectorized(parse_input(args.input), stats=stats)
     print(f"Total number of timelines: {result}")
+    if stats is not None:
+        stats.save(args.stats)
+        print(f"Wrote {len(stats.samples)} row samples to {args.stats}")
 
-    with open('answer_part2.txt', 'w') as f:
-        f.write(str(result))
+    # Only the puzzle input's answer is recorded
+    if args.input == 'input.txt':
+        with open('answer_part2.txt', 'w') as f:
+            f.write(str(result))
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,47 @@
+import os
+import tempfile
+import unittest
+from math import comb
+
+from solution import RowStats
+from solution_part2 import count_timelines, count_timelines_stream, count_timelines_vectorized
+
+def galton_board(splitter_rows):
+    """Manifold where every timeline hits a splitter on each splitter row."""
+    width = 2 * splitter_rows + 3
+    start = splitter_rows + 1
+    grid = ['.' * start + 'S' + '.' * (width - start - 1)]
+    for k in range(splitter_rows):
+        row = ['.'] * width
+        for col in range(start - k, start + k + 1, 2):
+            row[col] = '^'
+        grid.append(''.join(row))
+        grid.append('.' * width)
+    return grid
+
+class TestTimelineOverflow(unittest.TestCase):
+    def test_counts_past_int64(self):
+        """Totals of 2^63 and beyond are exact, not wrapped."""
+        for n in (62, 63, 64, 65):
+            grid = galton_board(n)
+            self.assertEqual(count_timelines(grid), 2 ** n)
+            self.assertEqual(count_timelines_vectorized(grid), 2 ** n, n)
+
+    def test_stream_counts_past_int64(self):
+        """The streaming path switches to exact ints too."""
+        fd, path = tempfile.mkstemp(suffix='.txt')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write('\n'.join(galton_board(64)) + '\n')
+            self.assertEqual(count_timelines_stream(path), 2 ** 64)
+        finally:
+            os.remove(path)
+
+    def test_magnitude_bits(self):
+        """Row stats report the bit length of the true largest column count."""
+        stats = RowStats()
+        count_timelines_vectorized(galton_board(70), stats)
+        self.assertEqual(stats.samples[-1][3], comb(70, 35).bit_length())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,5 @@
+import numpy as np
+
 def parse_input(filename):
     with open(filename, 'r') as f:
         return [line.rstrip('\n') for line in f.readlines()]
@@ -51,6 +53,172 @@ def find_antinodes(grid):
 
     return antinodes
 
+def parse_coordinates(filename):
+    """Read one x,y,z junction box per line into an (n, 3) int64 array."""
+    with open(filename, 'r') as f:
+        rows = [line.strip().split(',') for line in f if line.strip()]
+    return np.array(rows, dtype=np.int64).reshape(-1, 3)
+
+# Cell offsets that, with pairs inside a cell, visit every pair of
+# neighbouring cells exactly once
+HALF_NEIGHBOURS = [(dx, dy, dz)
+                   for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)
+                   if (dx, dy, dz) > (0, 0, 0)]
+
+def pairs_within(points, radius):
+    """All pairs (i < j) at most radius apart, found by bucketing points into cubic cells.
+
+    Only points in the same or adjacent cells are compared, so the work is
+    proportional to the number of nearby pairs rather than n squared.
+    Returns (squared distances, i, j) as int64 arrays.
+    """
+    cells = np.floor_divide(points - points.min(axis=0), radius).astype(np.int64) + 1
+    dims = cells.max(axis=0) + 2
+    keys = (cells[:, 0] * dims[1] + cells[:, 1]) * dims[2] + cells[:, 2]
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+
+    found_i, found_j = [], []
+    for dx, dy, dz in [(0, 0, 0)] + HALF_NEIGHBOURS:
+        target = sorted_keys + (dx * dims[1] + dy) * dims[2] + dz
+        lo = np.searchsorted(sorted_keys, target, side='left')
+        hi = np.searchsorted(sorted_keys, target, side='right')
+        if (dx, dy, dz) == (0, 0, 0):
+            # Same cell: only partners after this point in sorted order
+            lo = np.arange(len(sorted_keys)) + 1
+        counts = np.maximum(hi - lo, 0)
+        if not counts.any():
+            continue
+        first = np.repeat(np.arange(len(sorted_keys)), counts)
+        starts = np.repeat(lo - np.cumsum(counts) + counts, counts)
+        second = starts + np.arange(counts.sum())
+        found_i.append(order[first])
+        found_j.append(order[second])
+
+    if not found_i:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty
+    i = np.concatenate(found_i)
+    j = np.concatenate(found_j)
+    i, j = np.minimum(i, j), np.maximum(i, j)
+    diff = points[i] - points[j]
+    dist2 = (diff * diff).sum(axis=1)
+    keep = dist2 <= radius * radius
+    return dist2[keep], i[keep], j[keep]
+
+def iter_pairs_by_distance(points, batch=1000):
+    """Yield (squared distance, i, j) for all pairs, closest first.
+
+    Pairs are found in shells of growing radius, each sized from the point
+    density to hold roughly `batch` more pairs, so only the shells actually
+    consumed are ever built. Ties are broken by (i, j).
+    """
+    n = len(points)
+    if n < 2:
+        return
+    extent = np.maximum(points.max(axis=0) - points.min(axis=0), 1).astype(float)
+    max_radius = float(np.sqrt((extent ** 2).sum())) + 1
+    # Pairs within r of uniform points: about n^2/2 * (4/3 pi r^3) / volume
+    density = n * n * 2 * np.pi / (3 * extent.prod())
+
+    inner = -1
+    emitted = 0
+    while emitted < n * (n - 1) // 2:
+        radius = min(((emitted + batch) / density) ** (1 / 3), max_radius)
+        dist2, i, j = pairs_within(points, radius)
+        shell = dist2 > inner
+        dist2, i, j = dist2[shell], i[shell], j[shell]
+        while len(dist2) == 0 and radius < max_radius:
+            radius = min(radius * 2, max_radius)
+            dist2, i, j = pairs_within(points, radius)
+            shell = dist2 > inner
+            dist2, i, j = dist2[shell], i[shell], j[shell]
+        for k in np.lexsort((j, i, dist2)):
+            yield int(dist2[k]), int(i[k]), int(j[k])
+        emitted += len(dist2)
+        inner = radius * radius
+        batch *= 2
+
+def k_closest_pairs(points, k):
+    """The k closest pairs as a list of (squared distance, i, j), closest first."""
+    pairs = []
+    for pair in iter_pairs_by_distance(points, batch=k):
+        if len(pairs) == k:
+            break
+        pairs.append(pair)
+    return pairs
+
+class UnionFind:
+    """Disjoint sets over 0..n-1 with path compression and union by size."""
+
+    def __init__(self, n):
+        self.parent = list(range(n))
+        self.size = [1] * n
+        self.components = n
+
+    def find(self, x):
+        root = x
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[x] != root:
+            self.parent[x], x = root, self.parent[x]
+        return root
+
+    def union(self, a, b):
+        """Merge the sets holding a and b; returns False if they were already one set."""
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return False
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+        self.components -= 1
+        return True
+
+    def component_sizes(self):
+        """Sizes of all components, largest first."""
+        return sorted((self.size[x] for x in range(len(self.parent)) if self.parent[x] == x),
+                      reverse=True)
+
+def circuit_sizes(points, connections):
+    """Circuit sizes, largest first, after joining the `connections` closest pairs."""
+    circuits = UnionFind(len(points))
+    for _, i, j in k_closest_pairs(points, connections):
+        circuits.union(i, j)
+    return circuits.component_sizes()
+
+def circuit_sizes_at(points, checkpoints):
+    """Circuit sizes after each number of connections in checkpoints, in one pass.
+
+    Returns {connections: sizes largest first}.
+    """
+    remaining = sorted(set(checkpoints))
+    result = {}
+    circuits = UnionFind(len(points))
+    made = 0
+    if remaining and remaining[0] == 0:
+        result[remaining.pop(0)] = circuits.component_sizes()
+    if not remaining:
+        return result
+    for _, i, j in iter_pairs_by_distance(points, batch=remaining[-1]):
+        circuits.union(i, j)
+        made += 1
+        if made == remaining[0]:
+            result[remaining.pop(0)] = circuits.component_sizes()
+            if not remaining:
+                break
+    for count in remaining:
+        result[count] = circuits.component_sizes()
+    return result
+
+def largest_circuits_product(points, connections=1000, top=3):
+    """Product of the `top` largest circuit sizes after the closest connections."""
+    product = 1
+    for size in circuit_sizes(points, connections)[:top]:
+        product *= size
+    return product
+
 def main():
     grid = parse_input('input.txt')
     antinodes = find_antinodes(grid)
@@ -1,5 +1,7 @@
 import unittest
-from solution import parse_input, find_antennas, find_antinodes
+from solution import (parse_input, find_antennas, find_antinodes, parse_coordinates,
+                      k_closest_pairs, UnionFind, circuit_sizes, circuit_sizes_at,
+                      largest_circuits_product)
 
 class TestDay8(unittest.TestCase):
     def setUp(self):
@@ -36,5 +38,40 @@ class TestDay8(unittest.TestCase):
         self.assertIn((8, 8), antennas['A'])
         self.assertIn((9, 9), antennas['A'])
 
+class TestJunctionBoxes(unittest.TestCase):
+    def setUp(self):
+        self.points = parse_coordinates('test_input_boxes.txt')
+
+    def test_parse_coordinates(self):
+        """Test that coordinates are parsed into an (n, 3) array."""
+        self.assertEqual(self.points.shape, (20, 3))
+        self.assertEqual(list(self.points[0]), [162, 817, 812])
+
+    def test_closest_pairs(self):
+        """The closest pairs match the example, closest first."""
+        pairs = k_closest_pairs(self.points, 3)
+        self.assertEqual([(i, j) for _, i, j in pairs], [(0, 19), (0, 7), (2, 13)])
+        distances = [d for d, _, _ in k_closest_pairs(self.points, 190)]
+        self.assertEqual(distances, sorted(distances))
+        self.assertEqual(len(k_closest_pairs(self.points, 500)), 190)
+
+    def test_union_find(self):
+        """Unions merge sets and report sizes largest first."""
+        circuits = UnionFind(5)
+        self.assertTrue(circuits.union(0, 1))
+        self.assertTrue(circuits.union(1, 2))
+        self.assertFalse(circuits.union(0, 2))
+        self.assertEqual(circuits.find(2), circuits.find(0))
+        self.assertEqual(circuits.component_sizes(), [3, 1, 1])
+        self.assertEqual(circuits.components, 3)
+
+    def test_circuits_after_ten_connections(self):
+        """After ten connections the three largest circuits multiply to 40."""
+        self.assertEqual(circuit_sizes(self.points, 10)[:3], [5, 4, 2])
+        self.assertEqual(largest_circuits_product(self.points, 10), 40)
+        sizes = circuit_sizes_at(self.points, [0, 10])
+        self.assertEqual(sizes[0], [1] * 20)
+        self.assertEqual(sizes[10], circuit_sizes(self.points, 10))
+
 if __name__ == '__main__':
     unittest.main()
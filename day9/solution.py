@@ -1,3 +1,9 @@
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+
+import numpy as np
+
+
 def parse_coordinates(data):
     """Parse coordinate pairs from input."""
     coords = []
@@ -32,6 +38,82 @@ def find_largest_rectangle(coords):
     return max_area, best_coords
 
 
+def iter_pair_area_blocks(coords, block_pairs=1 << 20):
+    """Yield (i, j, areas) arrays for all pairs i < j, a block of rows at a time.
+
+    Each block covers enough consecutive i rows to hold about block_pairs
+    pairs, so memory stays bounded however many coordinates there are.
+    """
+    points = np.asarray(coords, dtype=np.int64).reshape(-1, 2)
+    n = len(points)
+    rows_per_block = max(1, block_pairs // max(n, 1))
+    for start in range(0, n - 1, rows_per_block):
+        stop = min(start + rows_per_block, n - 1)
+        rows = np.arange(start, stop)
+        cols = np.arange(start + 1, n)
+        dx = np.abs(points[rows, 0][:, None] - points[cols, 0][None, :]) + 1
+        dy = np.abs(points[rows, 1][:, None] - points[cols, 1][None, :]) + 1
+        r, c = np.nonzero(cols[None, :] > rows[:, None])
+        yield rows[r], cols[c], (dx * dy)[r, c]
+
+
+def find_largest_rectangle_batched(coords):
+    """Vectorized version of find_largest_rectangle."""
+    max_area, best_coords = 0, None
+    for i_idx, j_idx, areas in iter_pair_area_blocks(coords):
+        best = int(np.argmax(areas))
+        if areas[best] > max_area:
+            max_area = int(areas[best])
+            best_coords = (coords[i_idx[best]], coords[j_idx[best]])
+    return max_area, best_coords
+
+
+def iter_pairs_by_area(coords, chunk_size=4096, max_band=1 << 22, bins=1 << 12, block_pairs=1 << 20):
+    """Yield (area, i, j) for all pairs in descending area order, ties by (i, j).
+
+    Pair areas are never held all at once. One pass over row blocks finds the
+    area range and one builds a histogram of it; the bins are then taken from
+    the top in bands of about chunk_size pairs, doubling up to max_band. Each
+    band costs one more pass over the blocks to collect and sort its pairs,
+    so a caller that stops early only pays for the bands it consumed.
+    """
+    low, high = None, None
+    for _, _, areas in iter_pair_area_blocks(coords, block_pairs):
+        if len(areas):
+            low = int(areas.min()) if low is None else min(low, int(areas.min()))
+            high = int(areas.max()) if high is None else max(high, int(areas.max()))
+    if low is None:
+        return
+
+    width = (high - low) // bins + 1
+    counts = np.zeros(bins, dtype=np.int64)
+    for _, _, areas in iter_pair_area_blocks(coords, block_pairs):
+        counts += np.bincount((areas - low) // width, minlength=bins)
+
+    target = chunk_size
+    top = bins
+    while top > 0:
+        # Take bins from the top until the band holds at least target pairs
+        bottom, size = top, 0
+        while bottom > 0 and size < target:
+            bottom -= 1
+            size += int(counts[bottom])
+        band_low, band_high = low + bottom * width, low + top * width
+        found_i, found_j, found_areas = [], [], []
+        for i_idx, j_idx, areas in iter_pair_area_blocks(coords, block_pairs):
+            keep = (areas >= band_low) & (areas < band_high)
+            found_i.append(i_idx[keep])
+            found_j.append(j_idx[keep])
+            found_areas.append(areas[keep])
+        i_idx = np.concatenate(found_i)
+        j_idx = np.concatenate(found_j)
+        areas = np.concatenate(found_areas)
+        order = np.lexsort((j_idx, i_idx, -areas))
+        yield from zip(areas[order].tolist(), i_idx[order].tolist(), j_idx[order].tolist())
+        top = bottom
+        target = min(target * 2, max_band)
+
+
 def get_line_points(p1, p2):
     """Get all integer points on the line between p1 and p2."""
     x1, y1 = p1
@@ -54,7 +136,118 @@ def get_line_points(p1, p2):
     return points
 
 
-def point_in_polygon(point, polygon):
+def merge_intervals(intervals):
+    """Merge overlapping or adjacent inclusive integer intervals.
+
+    Returns parallel (starts, ends) lists sorted by start, ready for bisect.
+    """
+    starts, ends = [], []
+    for lo, hi in sorted(intervals):
+        if ends and lo <= ends[-1] + 1:
+            ends[-1] = max(ends[-1], hi)
+        else:
+            starts.append(lo)
+            ends.append(hi)
+    return starts, ends
+
+
+def in_intervals(starts, ends, value):
+    """Check if value lies in one of the merged intervals."""
+    i = bisect_right(starts, value) - 1
+    return i >= 0 and ends[i] >= value
+
+
+def build_row_sweep(polygon, vertical):
+    """Sweep the rows of a rectilinear polygon.
+
+    vertical maps each x to the raw (lo, hi) spans of the vertical edges at
+    that x. They must not be merged: two edges at the same x that are only
+    adjacent (one ends at y, the next starts at y + 1) do not cross the slab
+    between them. Between two consecutive vertex rows the set of vertical
+    edges crossing a row is constant, so each such slab stores the sorted x
+    positions of its crossing edges. Each row class (a vertex row, or the open slab between two
+    vertex rows) also stores the merged x intervals of tiles that are red or
+    green on that row.
+
+    Returns (ys, slabs, covers) where covers[2k] belongs to row ys[k] and
+    covers[2k + 1] to the rows strictly between ys[k] and ys[k + 1].
+    """
+    ys = sorted(set(y for _, y in polygon))
+    y_pos = {y: k for k, y in enumerate(ys)}
+    slabs = [[] for _ in range(len(ys) - 1)]
+    for x, spans in vertical.items():
+        for lo, hi in spans:
+            for k in range(y_pos[lo], y_pos[hi]):
+                slabs[k].append(x)
+    for slab in slabs:
+        slab.sort()
+
+    # Inside tiles of an open slab lie between pairs of crossing edges
+    slab_cover = [list(zip(xs[0::2], xs[1::2])) for xs in slabs]
+
+    horizontal_rows = {}
+    n = len(polygon)
+    for i in range(n):
+        x1, y1 = polygon[i]
+        x2, y2 = polygon[(i + 1) % n]
+        if y1 == y2:
+            horizontal_rows.setdefault(y1, []).append((min(x1, x2), max(x1, x2)))
+
+    covers = []
+    for k, y in enumerate(ys):
+        # A vertex row is covered wherever the slab above or below is, plus
+        # its own horizontal edges
+        intervals = list(horizontal_rows.get(y, []))
+        if k > 0:
+            intervals.extend(slab_cover[k - 1])
+        if k < len(slabs):
+            intervals.extend(slab_cover[k])
+        covers.append(merge_intervals(intervals))
+        if k < len(slabs):
+            covers.append(merge_intervals(slab_cover[k]))
+
+    return ys, slabs, covers
+
+
+def build_edge_index(polygon):
+    """Index the edges of a rectilinear polygon for O(log n) queries.
+
+    Vertical edges are grouped by x and horizontal edges by y. The merged
+    (starts, ends) intervals of each group answer is_point_on_edge; the row
+    and column sweeps are built from the raw edges with build_row_sweep, the
+    column one by running it on the transposed polygon. Build the index once
+    and pass it to the query functions. Raises ValueError if an edge is not
+    axis-aligned.
+    """
+    vertical = {}
+    horizontal = {}
+    n = len(polygon)
+    for i in range(n):
+        x1, y1 = polygon[i]
+        x2, y2 = polygon[(i + 1) % n]
+        if x1 == x2:
+            vertical.setdefault(x1, []).append((min(y1, y2), max(y1, y2)))
+        elif y1 == y2:
+            horizontal.setdefault(y1, []).append((min(x1, x2), max(x1, x2)))
+        else:
+            raise ValueError(f"Edge {polygon[i]} -> {polygon[(i + 1) % n]} is not axis-aligned")
+
+    transposed = [(y, x) for x, y in polygon]
+    ys, slabs, row_covers = build_row_sweep(polygon, vertical)
+    xs, _, col_covers = build_row_sweep(transposed, horizontal)
+
+    return {
+        'vertical': {x: merge_intervals(v) for x, v in vertical.items()},
+        'horizontal': {y: merge_intervals(h) for y, h in horizontal.items()},
+        'ys': ys,
+        'slabs': slabs,
+        'row_covers': row_covers,
+        'xs': xs,
+        'col_covers': col_covers,
+    }
+
+
+def point_in_polygon_linear(point, polygon):
     """Check if a point is inside a polygon using ray casting algorithm."""
     x, y = point
     n = len(polygon)
@@ -75,7 +268,26 @@ def point_in_polygon(point, polygon):
     return inside
 
 
-def is_point_on_edge(point, red_coords):
+def point_in_polygon(point, polygon, index=None):
+    """Check if a point is inside a polygon using ray casting algorithm.
+
+    With an index from build_edge_index the answer comes from the slab
+    sweep: the ray to the right crosses every vertical edge of the point's
+    slab with x >= point x. Without one the edges are scanned linearly.
+    """
+    if index is None:
+        return point_in_polygon_linear(point, polygon)
+
+    x, y = point
+    k = bisect_left(index['ys'], y) - 1
+    if k < 0 or k >= len(index['slabs']):
+        return False
+    xs = index['slabs'][k]
+    crossings = len(xs) - bisect_left(xs, x)
+    return crossings % 2 == 1
+
+
+def is_point_on_edge_linear(point, red_coords):
     """Check if a point is on the edge of the polygon."""
     for i in range(len(red_coords)):
         p1 = red_coords[i]
@@ -96,6 +308,44 @@ def is_point_on_edge(point, red_coords):
     return False
 
 
+def is_point_on_edge(point, red_coords, index=None):
+    """Check if a point is on the edge of the polygon, using index if given."""
+    if index is None:
+        return is_point_on_edge_linear(point, red_coords)
+
+    x, y = point
+    if x in index['vertical'] and in_intervals(*index['vertical'][x], y):
+        return True
+    if y in index['horizontal'] and in_intervals(*index['horizontal'][y], x):
+        return True
+    return False
+
+
+def is_segment_inside(p1, p2, index):
+    """Check if every tile of an axis-aligned segment is red or green.
+
+    index is the polygon's edge index from build_edge_index.
+    """
+    (x1, y1), (x2, y2) = p1, p2
+    if y1 == y2:
+        lines, covers, fixed, lo, hi = index['ys'], index['row_covers'], y1, min(x1, x2), max(x1, x2)
+    elif x1 == x2:
+        lines, covers, fixed, lo, hi = index['xs'], index['col_covers'], x1, min(y1, y2), max(y1, y2)
+    else:
+        raise ValueError(f"Segment {p1} -> {p2} is not axis-aligned")
+
+    pos = bisect_left(lines, fixed)
+    if pos < len(lines) and lines[pos] == fixed:
+        starts, ends = covers[2 * pos]
+    elif 0 < pos < len(lines):
+        starts, ends = covers[2 * pos - 1]
+    else:
+        return False
+
+    i = bisect_right(starts, lo) - 1
+    return i >= 0 and ends[i] >= hi
+
+
 def is_point_green(point, red_coords, red_tiles):
     """Check if a point is green (on edge or inside polygon, but not red)."""
     if point in red_tiles:
@@ -127,36 +377,213 @@ def is_rectangle_valid(coord1, coord2, red_coords, red_tiles):
     return True
 
 
-def solve_part1(data):
+def compress_axis(values):
+    """Compress sorted coordinates into cell start positions.
+
+    Every distinct value gets its own one-tile cell, and every non-empty gap
+    between neighbouring values is collapsed into a single cell. One padding
+    cell is added on each side so the outside of the polygon is connected.
+    Returns the list of cell start positions and a dict mapping each original
+    value to its cell index.
+    """
+    vals = sorted(set(values))
+    starts = [vals[0] - 1]
+    index = {}
+    for k, v in enumerate(vals):
+        index[v] = len(starts)
+        starts.append(v)
+        if k + 1 < len(vals) and vals[k + 1] > v + 1:
+            starts.append(v + 1)
+    starts.append(vals[-1] + 1)
+    return starts, index
+
+
+def build_rectangle_validator(coords):
+    """Build an O(1) check for "rectangle contains only red or green tiles".
+
+    The polygon is drawn onto a coordinate-compressed grid, the outside is
+    flood filled from the padding border, and a 2D prefix sum of outside cells
+    is built once. A rectangle with corners on polygon vertices is valid when
+    it covers no outside cell. Raises ValueError if an edge is not
+    axis-aligned.
+    """
+    xs, x_index = compress_axis([x for x, _ in coords])
+    ys, y_index = compress_axis([y for _, y in coords])
+    width, height = len(xs), len(ys)
+
+    # Mark boundary cells
+    boundary = bytearray(width * height)
+    n = len(coords)
+    for i in range(n):
+        x1, y1 = coords[i]
+        x2, y2 = coords[(i + 1) % n]
+        if x1 != x2 and y1 != y2:
+            raise ValueError(f"Edge {coords[i]} -> {coords[(i + 1) % n]} is not axis-aligned")
+        c1, c2 = sorted((x_index[x1], x_index[x2]))
+        r1, r2 = sorted((y_index[y1], y_index[y2]))
+        for r in range(r1, r2 + 1):
+            row_start = r * width
+            for c in range(c1, c2 + 1):
+                boundary[row_start + c] = 1
+
+    # Flood fill the outside starting from the padded corner
+    outside = bytearray(width * height)
+    outside[0] = 1
+    stack = [0]
+    while stack:
+        cell = stack.pop()
+        r, c = divmod(cell, width)
+        neighbors = []
+        if c > 0:
+            neighbors.append(cell - 1)
+        if c < width - 1:
+            neighbors.append(cell + 1)
+        if r > 0:
+            neighbors.append(cell - width)
+        if r < height - 1:
+            neighbors.append(cell + width)
+        for nxt in neighbors:
+            if not outside[nxt] and not boundary[nxt]:
+                outside[nxt] = 1
+                stack.append(nxt)
+
+    # prefix[r][c] = number of outside cells in rows < r and columns < c
+    prefix = [[0] * (width + 1)]
+    for r in range(height):
+        above = prefix[-1]
+        row = [0] * (width + 1)
+        running = 0
+        row_start = r * width
+        for c in range(width):
+            running += outside[row_start + c]
+            row[c + 1] = above[c + 1] + running
+        prefix.append(row)
+
+    def is_valid(p1, p2):
+        """Check whether the rectangle with corners p1 and p2 is fully inside."""
+        c1, c2 = sorted((x_index[p1[0]], x_index[p2[0]]))
+        r1, r2 = sorted((y_index[p1[1]], y_index[p2[1]]))
+        outside_cells = (prefix[r2 + 1][c2 + 1] - prefix[r1][c2 + 1]
+                         - prefix[r2 + 1][c1] + prefix[r1][c1])
+        return outside_cells == 0
+
+    return is_valid
+
+
+class LRUCache:
+    """Size-capped point cache with least-recently-used eviction.
+
+    Drop-in for the plain dict used as green_cache in solve_part2: it supports
+    get() and item assignment, and counts hits, misses and evictions so the
+    cache can be sized (or dropped) for a given input.
+    """
+
+    def __init__(self, maxsize=1 << 20):
+        if maxsize <= 0:
+            raise ValueError(f"maxsize must be positive, got {maxsize}")
+        self.maxsize = maxsize
+        self.data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        if key in self.data:
+            self.hits += 1
+            self.data.move_to_end(key)
+            return self.data[key]
+        self.misses += 1
+        return default
+
+    def __setitem__(self, key, value):
+        self.data[key] = value
+        self.data.move_to_end(key)
+        if len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+            self.evictions += 1
+
+    def __len__(self):
+        return len(self.data)
+
+    def stats(self):
+        """Return the counters and the current fill level as a dict."""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self.data),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+
+def solve_part1(data, batched=False):
     """Solve Part 1: Find largest rectangle area."""
     coords = parse_coordinates(data)
-    max_area, best_coords = find_largest_rectangle(coords)
+    if batched:
+        max_area, best_coords = find_largest_rectangle_batched(coords)
+    else:
+        max_area, best_coords = find_largest_rectangle(coords)
     return max_area
 
 
-def solve_part2(data):
-    """Solve Part 2: Find largest rectangle using only red and green tiles - OPTIMIZED."""
+def solve_part2(data, method='compressed', batched=False, green_cache=None):
+    """Solve Part 2: Find largest rectangle using only red and green tiles - OPTIMIZED.
+
+    method='compressed' checks each candidate with the prefix-sum validator
+    from build_rectangle_validator; method='segments' checks the four sides
+    with is_segment_inside; method='perimeter' walks the rectangle perimeter
+    tile by tile. batched=True generates the candidate pairs with
+    NumPy via iter_pairs_by_area instead of a sorted list of tuples.
+
+    green_cache holds point results for method='perimeter'. Any object with
+    get() and item assignment works; by default a fresh LRUCache is used.
+    Pass an LRUCache to read its stats() afterwards, or {} for no size cap.
+    """
     coords = parse_coordinates(data)
     red_tiles = set(coords)
     n = len(coords)
+
+    index = None
+    if method == 'compressed':
+        is_valid = build_rectangle_validator(coords)
+    elif method == 'segments':
+        index = build_edge_index(coords)
+
+        def is_valid(p1, p2):
+            corners = [p1, (p2[0], p1[1]), p2, (p1[0], p2[1])]
+            return all(is_segment_inside(corners[k], corners[(k + 1) % 4], index)
+                       for k in range(4))
+    elif method == 'perimeter':
+        is_valid = None
+        # Polygons with diagonal edges fall back to the linear point checks
+        try:
+            index = build_edge_index(coords)
+        except ValueError:
+            pass
+    else:
+        raise ValueError(f"Unknown method: {method}")
     
     # Cache for point checks
-    green_cache = {}
+    if green_cache is None:
+        green_cache = LRUCache()
     
     def is_green_or_red(point):
         """Check if point is red or green (valid for rectangle)."""
         if point in red_tiles:
             return True
-        if point in green_cache:
-            return green_cache[point]
+        cached = green_cache.get(point)
+        if cached is not None:
+            return cached
         
         # Check if on edge
-        if is_point_on_edge(point, coords):
+        if is_point_on_edge(point, coords, index):
             green_cache[point] = True
             return True
         
         # Check if inside polygon
-        result = point_in_polygon(point, coords)
+        result = point_in_polygon(point, coords, index)
         green_cache[point] = result
         return result
 
@@ -183,13 +610,16 @@ def solve_part2(data):
     
     # Build sorted list by area potential
     # print(f"Processing {n} coordinates, generating pairs...")
-    coord_pairs = []
-    for i in range(n):
-        for j in range(i + 1, n):
-            area = calculate_rectangle_area(coords[i], coords[j])
-            coord_pairs.append((area, i, j))
-    
-    coord_pairs.sort(reverse=True)
+    if batched:
+        coord_pairs = iter_pairs_by_area(coords)
+    else:
+        coord_pairs = []
+        for i in range(n):
+            for j in range(i + 1, n):
+                area = calculate_rectangle_area(coords[i], coords[j])
+                coord_pairs.append((area, i, j))
+
+        coord_pairs.sort(reverse=True)
     # print(f"Checking {len(coord_pairs)} pairs in descending area order...")
     
     checked = 0
@@ -198,7 +628,11 @@ def solve_part2(data):
             # print(f"Stopping early after {checked} checks (remaining pairs too small)")
             break
         
-        if is_rectangle_valid_perimeter_only(coords[i], coords[j]):
+        if is_valid is not None:
+            valid = is_valid(coords[i], coords[j])
+        else:
+            valid = is_rectangle_valid_perimeter_only(coords[i], coords[j])
+        if valid:
             max_area = area
             # print(f"Found valid rectangle: area={area} at coords[{i}] and coords[{j}]")
         
@@ -0,0 +1,52 @@
+import unittest
+from solution import (build_edge_index, point_in_polygon, point_in_polygon_linear,
+                      is_point_on_edge, is_point_on_edge_linear, is_segment_inside,
+                      solve_part2)
+
+EXAMPLE = """7,1
+11,1
+11,7
+9,7
+9,5
+2,5
+2,3
+7,3"""
+
+# Two vertical edges at x=8 (y 2..4 and y 5..7) that are adjacent but separate
+ADJACENT_EDGES = [(8, 2), (8, 4), (10, 4), (10, 5), (8, 5), (8, 7), (3, 7), (3, 5), (1, 5), (1, 2)]
+
+class TestEdgeIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = build_edge_index(ADJACENT_EDGES)
+
+    def test_point_in_polygon_matches_linear(self):
+        """Indexed and linear ray casting agree around collinear adjacent edges."""
+        for x in range(-1, 12):
+            for y in range(0, 9):
+                self.assertEqual(point_in_polygon((x, y), ADJACENT_EDGES, self.index),
+                                 point_in_polygon_linear((x, y), ADJACENT_EDGES), (x, y))
+
+    def test_point_on_edge_matches_linear(self):
+        """Indexed and linear edge checks agree."""
+        for x in range(-1, 12):
+            for y in range(0, 9):
+                self.assertEqual(is_point_on_edge((x, y), ADJACENT_EDGES, self.index),
+                                 is_point_on_edge_linear((x, y), ADJACENT_EDGES), (x, y))
+
+    def test_segment_between_adjacent_edges(self):
+        """The row between the adjacent edges is only covered inside the polygon."""
+        self.assertTrue(is_segment_inside((1, 5), (10, 5), self.index))
+        self.assertFalse(is_segment_inside((0, 5), (10, 5), self.index))
+        self.assertFalse(is_segment_inside((1, 6), (10, 6), self.index))
+
+    def test_solve_part2_methods_agree(self):
+        """Every part 2 method finds the example's largest rectangle."""
+        for method in ('compressed', 'segments', 'perimeter'):
+            self.assertEqual(solve_part2(EXAMPLE, method=method), 24, method)
+    def test_compressed_rejects_diagonal_edges(self):
+        """The compressed validator refuses polygons it cannot represent."""
+        with self.assertRaises(ValueError):
+            solve_part2("0,0\n5,0\n3,4", method='compressed')
+
+if __name__ == '__main__':
+    unittest.main()